@@ -0,0 +1,92 @@
+"""Time building a CommentTree and its thread statistics.
+
+Builds a synthetic thread of nested comments, converts it with
+CommentTree.from_listing and times each statistic. With numpy installed
+the statistics run vectorised; ``--no-numpy`` times the pure-Python
+fallback instead.
+
+    python benchmarks/bench_comment_tree.py --comments 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+src_path = os.path.join(project_root, "src")
+sys.path.append(src_path)
+
+from yars import columns  # noqa: E402
+from yars.columns import CommentTree  # noqa: E402
+
+
+def synthetic_thread(n, max_depth=10, seed=0):
+    """Raw t1 children of a thread with ``n`` comments in random nesting."""
+    rng = random.Random(seed)
+    top = []
+    open_lists = [(top, 0)]
+    for i in range(n):
+        children, depth = rng.choice(open_lists)
+        replies = []
+        children.append(
+            {
+                "kind": "t1",
+                "data": {
+                    "author": f"user{i % 2000}",
+                    "body": "lorem ipsum " * 5,
+                    "score": rng.randrange(-50, 5000),
+                    "replies": {"kind": "Listing", "data": {"children": replies}},
+                },
+            }
+        )
+        if depth + 1 < max_depth:
+            open_lists.append((replies, depth + 1))
+    return top
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=50000)
+    parser.add_argument("--no-numpy", action="store_true")
+    args = parser.parse_args()
+    if args.no_numpy:
+        columns._numpy = lambda: None
+
+    children = synthetic_thread(args.comments)
+    tree = CommentTree.from_listing(children)
+
+    def first_subtree():
+        tree._ends = None
+        tree.subtree(0)
+
+    cases = {
+        "from_listing": lambda: CommentTree.from_listing(children),
+        "subtree_sizes": tree.subtree_sizes,
+        "subtree_scores": tree.subtree_scores,
+        "subtree (first call)": first_subtree,
+        "children(0)": lambda: tree.children(0),
+        "top_k(10)": tree.top_k,
+        "top_k(10, subtree=True)": lambda: tree.top_k(subtree=True),
+        "depth_histogram": tree.depth_histogram,
+        "author_totals": tree.author_totals,
+    }
+    mode = "pure Python" if columns._numpy() is None else "numpy"
+    print(f"{len(tree)} comments, {mode}")
+    for name, fn in cases.items():
+        print(f"{name:>24}: {timed(fn):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
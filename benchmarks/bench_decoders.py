@@ -0,0 +1,127 @@
+"""Compare JSON decoder backends on Reddit payloads.
+
+Pass recorded responses as files - e.g. saved with
+``curl -A yars https://www.reddit.com/r/python/comments/<id>.json`` - or
+run without arguments to use a synthetic 2,000-comment thread padded with
+the kind of unused fields Reddit sends. Files whose name contains
+"comments" are treated as threads, others as listings.
+
+    python benchmarks/bench_decoders.py thread.json hot.json --runs 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+src_path = os.path.join(project_root, "src")
+sys.path.append(src_path)
+
+from yars.decoders import DECODERS  # noqa: E402
+from yars.parsers import (  # noqa: E402
+    parse_listing_page,
+    parse_listing_post,
+    parse_post_details,
+)
+
+THREAD_PATH = "/r/bench/comments/abc/bench"
+LISTING_PATH = "/r/bench/hot"
+
+# Stand-ins for the fields Reddit sends but YARS never reads.
+PADDING = {f"unused_field_{i}": f"value {i}" for i in range(60)}
+
+
+def synthetic_thread(top_level=200, replies=9):
+    def comment(i, children=()):
+        return {
+            "kind": "t1",
+            "data": {
+                **PADDING,
+                "id": f"c{i}",
+                "name": f"t1_c{i}",
+                "author": f"user{i % 97}",
+                "body": "lorem ipsum " * 20,
+                "score": i % 500,
+                "replies": (
+                    {"kind": "Listing", "data": {"children": list(children)}}
+                    if children
+                    else ""
+                ),
+            },
+        }
+
+    comments = [
+        comment(t, [comment(t * 100 + r) for r in range(replies)])
+        for t in range(top_level)
+    ]
+    post = {"kind": "t3", "data": {**PADDING, "title": "bench", "selftext": "body"}}
+    return [
+        {"kind": "Listing", "data": {"children": [post]}},
+        {"kind": "Listing", "data": {"children": comments}},
+    ]
+
+
+def load_payloads(paths):
+    if not paths:
+        body = json.dumps(synthetic_thread()).encode()
+        return [("synthetic thread", THREAD_PATH, body)]
+    payloads = []
+    for path in paths:
+        with open(path, "rb") as f:
+            body = f.read()
+        api_path = THREAD_PATH if "comments" in os.path.basename(path) else LISTING_PATH
+        payloads.append((os.path.basename(path), api_path, body))
+    return payloads
+
+
+def parse(data, api_path):
+    if api_path == THREAD_PATH:
+        return parse_post_details(data, api_path)
+    return parse_listing_page(data, parse_listing_post)
+
+
+def bench(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("payloads", nargs="*")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, api_path, body in load_payloads(args.payloads):
+        print(f"{name} ({len(body) / 1024:.0f} KB), median of {args.runs} runs:")
+        expected = None
+        for backend, cls in DECODERS.items():
+            try:
+                decoder = cls()
+            except ImportError:
+                print(f"  {backend:<8} not installed")
+                continue
+            result = parse(decoder.decode(body, api_path), api_path)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                print(f"  {backend:<8} parsed result differs from json!")
+            decode_ms = bench(lambda: decoder.decode(body, api_path), args.runs)
+            total_ms = bench(
+                lambda: parse(decoder.decode(body, api_path), api_path), args.runs
+            )
+            print(
+                f"  {backend:<8} decode {decode_ms:7.2f} ms"
+                f"   decode+parse {total_ms:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
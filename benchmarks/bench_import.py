@@ -0,0 +1,70 @@
+"""Measure how long `import yars` takes in a fresh interpreter.
+
+Runs the import in new subprocesses (so nothing is cached in-process) and
+reports the median of ``python -X importtime`` for yars and its heaviest
+submodules. Pass --max-ms to fail when the import gets slower than that,
+e.g. in CI:
+
+    python benchmarks/bench_import.py --runs 20 --max-ms 250
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+src_path = os.path.join(project_root, "src")
+
+MODULES = ("yars", "yars.yars", "yars.agents", "yars.aio", "requests", "httpx")
+
+
+def import_times(statement):
+    """Cumulative import time in ms per module for one fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=src_path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # header line
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--statement", default="import yars")
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    import_times(args.statement)  # warm the bytecode cache
+    runs = [import_times(args.statement) for _ in range(args.runs)]
+    print(f"{args.statement!r}, median of {args.runs} runs:")
+    for module in MODULES:
+        samples = [run[module] for run in runs if module in run]
+        if samples:
+            print(f"  {module:<12} {statistics.median(samples):8.1f} ms")
+        else:
+            print(f"  {module:<12}      not imported")
+
+    total = statistics.median(run.get("yars", 0.0) for run in runs)
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"import yars took {total:.1f} ms, over the {args.max_ms} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare the memory of dict results and records.Post/Comment records.
+
+Parses a synthetic listing of posts and a flat list of comments with the
+dict parsers and with the record parsers, and reports the memory each
+result set holds (measured with tracemalloc, so strings shared with the
+decoded payload aren't counted twice).
+
+    python benchmarks/bench_records.py --posts 50000 --comments 200000
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+src_path = os.path.join(project_root, "src")
+sys.path.append(src_path)
+
+from yars.parsers import DICT_PARSERS, extract_comments  # noqa: E402
+from yars.records import RECORD_PARSERS  # noqa: E402
+
+
+def synthetic_posts(n):
+    return [
+        {
+            "kind": "t3",
+            "data": {
+                "title": f"Post title number {i}",
+                "author": f"user{i % 500}",
+                "permalink": f"/r/bench/comments/{i:x}/post_title_number_{i}/",
+                "score": i % 5000,
+                "num_comments": i % 300,
+                "created_utc": 1700000000.0 + i,
+                "selftext": "lorem ipsum " * 10,
+                "thumbnail": "self",
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_comments(n):
+    return [
+        {
+            "kind": "t1",
+            "data": {
+                "author": f"user{i % 500}",
+                "body": "lorem ipsum " * 5,
+                "score": i % 5000,
+                "replies": "",
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--comments", type=int, default=200000)
+    args = parser.parse_args()
+
+    posts = synthetic_posts(args.posts)
+    comments = synthetic_comments(args.comments)
+    cases = {
+        f"{args.posts} posts": lambda parsers: [
+            parsers.listing_post(child) for child in posts
+        ],
+        f"{args.comments} comments": lambda parsers: extract_comments(
+            comments, comment=parsers.comment
+        ),
+    }
+    for name, build in cases.items():
+        dicts = measure(lambda: build(DICT_PARSERS))
+        records = measure(lambda: build(RECORD_PARSERS))
+        print(
+            f"{name:>18}: dicts {dicts / 2**20:6.1f} MB"
+            f"   records {records / 2**20:6.1f} MB   ({dicts / records:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
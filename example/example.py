@@ -66,10 +66,11 @@ def scrape_subreddit_data(subreddit_name, limit=5, filename=filename):
         except (FileNotFoundError, json.JSONDecodeError):
             existing_data = []
 
-        # Scrape details and comments for each post
-        for i, post in enumerate(subreddit_posts, 1):
-            permalink = post["permalink"]
-            post_details = miner.scrape_post_details(permalink)
+        # Scrape details and comments for all posts concurrently
+        permalinks = [post["permalink"] for post in subreddit_posts]
+        results = miner.scrape_many_post_details(permalinks, max_workers=4)
+        for i, (post, result) in enumerate(zip(subreddit_posts, results), 1):
+            post_details = result.value
             print(f"Processing post {i}")
 
             if post_details:
@@ -1,3 +1,12 @@
 from .yars import YARS
 
-__all__ = ["YARS"]
+__all__ = ["AsyncYARS", "YARS"]
+
+
+def __getattr__(name):
+    # AsyncYARS pulls in asyncio and httpx; only import them when asked for.
+    if name == "AsyncYARS":
+        from .aio import AsyncYARS
+
+        return AsyncYARS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
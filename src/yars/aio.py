@@ -0,0 +1,727 @@
+"""Asynchronous Reddit scraper.
+
+AsyncYARS mirrors the YARS API with coroutines on a pooled httpx client, so
+one process can keep many requests in flight. Requires the optional
+``httpx`` dependency (``pip install yars[async]``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from functools import partial
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from .agents import default_rotator
+from .aio_batch import async_fan_out, async_flatten_pages, async_interleave
+from .cache import conditional_headers, is_fresh
+from .client import DEFAULT_OAUTH_USER_AGENT, TOKEN_URL, BaseClient
+from .columns import CommentTree, PostBatch, listing_post_data
+from .pagination import AsyncListing
+from .parsers import (
+    chunk_fullnames,
+    chunk_ids,
+    iter_comments,
+    parse_listing_page,
+    splice_more_children,
+)
+from .proxies import BLOCK_STATUSES, MAX_PROXY_ATTEMPTS
+from .retry import RetryPolicy, retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def _clean_params(params):
+    # requests silently drops None values; httpx would send them as "".
+    if not params:
+        return None
+    return {k: v for k, v in params.items() if v is not None}
+
+
+class AsyncYARS(BaseClient):
+    """Asynchronous Reddit scraper.
+
+    Same modes and return values as YARS. At most ``max_concurrency``
+    requests are in flight at once; the underlying connection pool is
+    shared by every coroutine using the instance. Use as an async context
+    manager, or call ``aclose()`` when done.
+
+    Requests are paced by ``rate_limiter`` exactly like in YARS; share one
+    RateLimiter between clients to give them a single budget. ``credentials``
+    spreads OAuth requests over several apps, and a list of proxies (or a
+    ProxyPool) as ``proxy`` rotates and fails over between them, as in
+    YARS; each proxy gets its own connection pool.
+
+    ``http2=True`` multiplexes requests over one HTTP/2 connection per host
+    (needs ``httpx[http2]``), and ``keep_alive=False`` closes connections
+    after every request. The client is meant for a single event loop.
+
+    Retries follow ``retry`` and ``token_retry``, failing endpoints trip
+    ``breaker``, responses are parsed by ``decoder`` and ``records``
+    selects record results, as in YARS;
+    ``max_retries`` only sets the retry count of the default data policy.
+    """
+
+    __slots__ = (
+        "client",
+        "_client_options",
+        "_proxy_clients",
+        "random_user_agent",
+        "user_agents",
+        "_token_locks",
+        "_refresh_tasks",
+        "_semaphore",
+    )
+
+    def __init__(
+        self,
+        proxy=None,
+        timeout=10,
+        random_user_agent=True,
+        client_id=None,
+        client_secret=None,
+        user_agent=None,
+        max_concurrency=10,
+        max_retries=5,
+        rate_limiter=None,
+        checkpoints=None,
+        cache=None,
+        memory_cache=None,
+        credentials=None,
+        user_agents=None,
+        http2=False,
+        keep_alive=True,
+        retry=None,
+        token_retry=None,
+        breaker=None,
+        decoder="auto",
+        records=False,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncYARS requires httpx - install it with `pip install httpx`"
+            )
+        super().__init__(
+            proxy=proxy,
+            timeout=timeout,
+            client_id=client_id,
+            client_secret=client_secret,
+            rate_limiter=rate_limiter,
+            checkpoints=checkpoints,
+            cache=cache,
+            memory_cache=memory_cache,
+            credentials=credentials,
+            retry=RetryPolicy(retries=max_retries) if retry is None else retry,
+            token_retry=token_retry,
+            breaker=breaker,
+            decoder=decoder,
+            records=records,
+        )
+        self._token_locks = defaultdict(asyncio.Lock)
+        self._refresh_tasks = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        headers = {}
+        if self.credentials:
+            headers["User-Agent"] = user_agent or DEFAULT_OAUTH_USER_AGENT
+        self.random_user_agent = random_user_agent and not self.credentials
+        self.user_agents = user_agents
+        # requests follows redirects by default and httpx doesn't; match YARS.
+        self._client_options = dict(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency if keep_alive else 0,
+            ),
+        )
+        self._proxy_clients = {}
+        self.client = httpx.AsyncClient(
+            proxy=None if self.proxy_pool else proxy, **self._client_options
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        for task in self._refresh_tasks.values():
+            task.cancel()
+        await self.client.aclose()
+        for client in self._proxy_clients.values():
+            await client.aclose()
+
+    def _client_for(self, proxy):
+        """The httpx client routing through ``proxy`` (httpx proxies per client)."""
+        if proxy is None:
+            return self.client
+        client = self._proxy_clients.get(proxy.url)
+        if client is None:
+            client = httpx.AsyncClient(proxy=proxy.url, **self._client_options)
+            self._proxy_clients[proxy.url] = client
+        return client
+
+    async def _ensure_token(self, credential):
+        """Make sure ``credential`` has a valid OAuth app-only token.
+
+        Concurrent callers share one token request. Shortly before expiry
+        the token is refreshed in a background task while requests keep
+        using the current one.
+        """
+        if credential.token_valid():
+            task = self._refresh_tasks.get(credential.client_id)
+            if credential.token_expiring() and (task is None or task.done()):
+                self._refresh_tasks[credential.client_id] = asyncio.ensure_future(
+                    self._refresh_token(credential)
+                )
+            return
+        async with self._token_locks[credential.client_id]:
+            # Another coroutine may have refreshed while we waited.
+            if not credential.token_valid():
+                await self._fetch_token(credential)
+
+    async def _refresh_token(self, credential):
+        try:
+            async with self._token_locks[credential.client_id]:
+                if credential.token_expiring():
+                    await self._fetch_token(credential)
+        except RuntimeError as e:
+            logger.warning("Background token refresh failed: %s", e)
+
+    async def _fetch_token(self, credential):
+        async def post():
+            proxy = self.proxy_pool.choose() if self.proxy_pool else None
+            return await self._client_for(proxy).post(
+                TOKEN_URL,
+                auth=credential.auth,
+                data={"grant_type": "client_credentials"},
+            )
+
+        try:
+            response = await self._with_retries(self.token_retry, post, TOKEN_URL)
+            response.raise_for_status()
+            token_data = response.json()
+            token = token_data["access_token"]
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise RuntimeError(
+                "Reddit OAuth token request failed - check REDDIT_CLIENT_ID / "
+                f"REDDIT_CLIENT_SECRET: {e}"
+            ) from e
+        credential.set_token(token, token_data.get("expires_in", 3600))
+        logger.info("Obtained Reddit OAuth token for %s", credential.client_id)
+
+    async def _throttle(self, credential=None):
+        """Wait until the rate limiter allows another request."""
+        if not self.rate_limiter:
+            return
+        key = credential.client_id if credential else None
+        delay = self.rate_limiter.reserve(self._mode, key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _with_retries(self, policy, send, url):
+        """Await ``send()`` until it gets a final response or ``policy`` gives up."""
+        state = policy.start()
+        while True:
+            try:
+                response = await send()
+            except httpx.HTTPError as e:
+                delay = state.next_delay() if policy.retry_errors else None
+                if delay is None:
+                    raise
+                logger.info(
+                    "Request to %s failed (%s), retrying in %.1fs", url, e, delay
+                )
+            else:
+                if not policy.should_retry(response.status_code):
+                    return response
+                delay = state.next_delay(retry_after(response.headers))
+                if delay is None:
+                    return response
+                logger.info(
+                    "HTTP %s from %s, retrying in %.1fs",
+                    response.status_code,
+                    url,
+                    delay,
+                )
+            await asyncio.sleep(delay)
+
+    async def _send(self, url, params, entry, credential):
+        """GET ``url`` with retries, as configured by ``self.retry``."""
+        return await self._with_retries(
+            self.retry,
+            partial(self._send_once, url, params, entry, credential),
+            url,
+        )
+
+    async def _send_once(self, url, params, entry, credential):
+        """GET ``url``, failing over to another proxy if the pool has one."""
+        attempts = (
+            min(len(self.proxy_pool), MAX_PROXY_ATTEMPTS) if self.proxy_pool else 1
+        )
+        for attempt in range(attempts):
+            proxy = self.proxy_pool.choose() if self.proxy_pool else None
+            await self._throttle(credential)
+            headers = conditional_headers(entry) or {}
+            if credential is not None:
+                headers.update(credential.headers)
+            agent = None
+            if self.random_user_agent:
+                rotator = self.user_agents or default_rotator()
+                agent = rotator.choose(proxy.url if proxy else None)
+                headers["User-Agent"] = agent
+            start = time.monotonic()
+            try:
+                async with self._semaphore:
+                    response = await self._client_for(proxy).get(
+                        url, params=params, headers=headers
+                    )
+            except httpx.HTTPError as e:
+                if proxy is None:
+                    raise
+                self.proxy_pool.record(proxy)
+                if attempt == attempts - 1:
+                    raise
+                logger.info("Proxy %s failed (%s), trying another", proxy.url, e)
+                continue
+            self._record_budget(response, credential)
+            if agent is not None:
+                rotator.record(agent, response.status_code)
+            if proxy is None:
+                break
+            self.proxy_pool.record(
+                proxy, response.status_code, time.monotonic() - start
+            )
+            if response.status_code not in BLOCK_STATUSES:
+                break
+            logger.info("Proxy %s got HTTP %s", proxy.url, response.status_code)
+        return response
+
+    async def _memoized(self, key, fetch, *args):
+        """Return a result through the in-memory LRU, if configured.
+
+        ``fetch(*args)`` returns ``(result, complete)``; only complete
+        results are cached, so a failed or partial fetch is retried.
+        """
+        if self.memory_cache is None:
+            return (await fetch(*args))[0]
+        result = self.memory_cache.get(key)
+        if result is None:
+            result, complete = await fetch(*args)
+            if complete:
+                self.memory_cache.put(key, result)
+        return result
+
+    async def _get_json(self, path, params=None, typed=True):
+        """Fetch a Reddit API path and return parsed JSON, or None on failure.
+
+        With a response cache, fresh entries are served without touching
+        the network and stale ones are revalidated when possible.
+        ``typed=False`` skips the decoder's schema and keeps every field.
+        Raises CircuitOpenError while the endpoint's circuit is open.
+        """
+        schema_path = path if typed else None
+        key, entry = self._cache_lookup(path, params)
+        if is_fresh(entry):
+            return self.decoder.decode(entry.body, schema_path)
+        credential = None
+        if self.credentials:
+            credential = self.credentials.choose()
+            await self._ensure_token(credential)
+        url = self._url(path)
+        params = _clean_params(params)
+        circuit = self._allow(url, path)
+        try:
+            response = await self._send(url, params, entry, credential)
+        except httpx.HTTPError as e:
+            self._record_outcome(circuit, None)
+            logger.warning("Request to %s failed: %s", url, e)
+            return None
+        except BaseException:
+            # Cancelled or interrupted: no verdict, but free a probe slot.
+            self._release(circuit)
+            raise
+        self._record_outcome(circuit, response.status_code)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, self.cache.ttl_for(path, params))
+            return self.decoder.decode(entry.body, schema_path)
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning("Request to %s failed: %s", url, e)
+            return None
+        try:
+            data = self.decoder.decode(response.content, schema_path)
+        except ValueError as e:
+            logger.warning("Invalid JSON from %s: %s", url, e)
+            return None
+        self._cache_store(key, path, params, response)
+        return data
+
+    async def handle_search(
+        self, path, params, after=None, before=None, fields=None, raw=False
+    ):
+        if after:
+            params["after"] = after
+        if before:
+            params["before"] = before
+
+        parsers, typed = self._parsers_for(fields, raw)
+        data = await self._get_json(path, params, typed)
+        return self._search_results(data, parsers, fields, raw)
+
+    async def search_reddit(
+        self,
+        query,
+        limit=10,
+        after=None,
+        before=None,
+        sort="relevance",
+        fields=None,
+        raw=False,
+    ):
+        params = {"q": query, "limit": limit, "sort": sort, "type": "link"}
+        return await self.handle_search("/search", params, after, before, fields, raw)
+
+    async def search_subreddit(
+        self,
+        subreddit,
+        query,
+        limit=10,
+        after=None,
+        before=None,
+        sort="relevance",
+        fields=None,
+        raw=False,
+    ):
+        params = {
+            "q": query,
+            "limit": limit,
+            "sort": sort,
+            "type": "link",
+            "restrict_sr": "on",
+        }
+        return await self.handle_search(
+            f"/r/{subreddit}/search", params, after, before, fields, raw
+        )
+
+    async def scrape_post_details(
+        self, permalink, expand_more=False, max_workers=1, fields=None, raw=False
+    ):
+        """Scrape a post's title, body and nested comments.
+
+        ``expand_more``, ``max_workers``, ``fields`` and ``raw`` behave as
+        in YARS.scrape_post_details.
+        """
+        path = permalink.rstrip("/")
+        if raw and expand_more:
+            raise ValueError("expand_more needs parsed comments, not raw=True")
+        fields = None if fields is None else tuple(fields)
+        return await self._memoized(
+            ("post", path, expand_more, fields, raw),
+            self._scrape_post_details,
+            path,
+            expand_more,
+            max_workers,
+            fields,
+            raw,
+        )
+
+    async def _scrape_post_details(self, path, expand_more, max_workers, fields, raw):
+        parsers, typed = self._parsers_for(fields, raw)
+        post_data = await self._get_json(path, typed=typed)
+        if post_data is None or raw:
+            return post_data, post_data is not None
+
+        details, pending = self._parse_thread(
+            post_data, path, expand_more, parsers, fields
+        )
+        if pending is not None:
+            await self._expand_more(*pending, max_workers, parsers.comment)
+        return details, details is not None
+
+    def scrape_many_post_details(
+        self,
+        permalinks,
+        max_workers=8,
+        ordered=True,
+        expand_more=False,
+        fields=None,
+        raw=False,
+    ):
+        """Scrape many posts concurrently, async-yielding BatchResults.
+
+        Same semantics as YARS.scrape_many_post_details, with at most
+        ``max_workers`` posts in flight.
+        """
+
+        async def scrape(permalink):
+            return await self.scrape_post_details(
+                permalink, expand_more, fields=fields, raw=raw
+            )
+
+        return async_fan_out(scrape, permalinks, max_workers, ordered)
+
+    async def scrape_comment_tree(self, permalink, expand_more=False, max_workers=1):
+        """Scrape a post's comments into a CommentTree.
+
+        Same semantics as YARS.scrape_comment_tree.
+        """
+        if expand_more:
+            details = await self.scrape_post_details(permalink, True, max_workers)
+            if details is None:
+                return None
+            return CommentTree.from_comments(details["comments"])
+
+        path = permalink.rstrip("/")
+        children = self._comment_listing(await self._get_json(path), path)
+        if children is None:
+            return None
+        return CommentTree.from_listing(children)
+
+    async def iter_post_comments(self, permalink):
+        """Async-iterate a post's comments as flat records.
+
+        Same records as YARS.iter_post_comments.
+        """
+        path = permalink.rstrip("/")
+        post_data = await self._get_json(path)
+        children = self._comment_listing(post_data, path)
+        if children is None:
+            return
+        main_post = post_data[0]["data"]["children"][0]["data"]
+        for record in iter_comments(children, main_post.get("name")):
+            yield record
+
+    async def _fetch_more_children(self, link_id, ids, semaphore):
+        params = self._more_children_params(link_id, ids)
+        async with semaphore:
+            data = await self._get_json("/api/morechildren", params)
+        return self._more_children_things(data)
+
+    async def _expand_more(self, link_id, comments, index, more, max_workers, comment):
+        """Resolve "more" stubs round by round until none are left."""
+        seen = set()
+        semaphore = asyncio.Semaphore(max_workers)
+        while more:
+            ids = [i for i in dict.fromkeys(more) if i not in seen]
+            more.clear()
+            if not ids:
+                break
+            seen.update(ids)
+            batches = await asyncio.gather(
+                *(
+                    self._fetch_more_children(link_id, batch, semaphore)
+                    for batch in chunk_ids(ids)
+                )
+            )
+            things = [t for batch in batches for t in batch]
+            added = splice_more_children(things, comments, index, more, comment)
+            logger.info("Expanded %d more comments for %s", added, link_id)
+
+    async def scrape_user_data(
+        self, username, limit=10, resume=False, fields=None, raw=False
+    ):
+        fields = None if fields is None else tuple(fields)
+        if resume:
+            # A resumed crawl returns only the remainder; don't cache that.
+            items, _ = await self._scrape_user_data(
+                username, limit, resume, fields, raw
+            )
+            return items
+        return await self._memoized(
+            ("user", username, limit, fields, raw),
+            self._scrape_user_data,
+            username,
+            limit,
+            False,
+            fields,
+            raw,
+        )
+
+    async def _scrape_user_data(self, username, limit, resume, fields, raw):
+        """Return ``(items, complete)``; a failed page makes it incomplete."""
+        logger.info("Scraping user data for %s, limit: %d", username, limit)
+        listing = self.iter_user_items(
+            username, limit, resume=resume, fields=fields, raw=raw
+        )
+        all_items = [item async for item in listing]
+        logger.info("Scraped %d items for user %s", len(all_items), username)
+        return all_items, not listing.failed
+
+    def iter_user_items(
+        self, username, limit=10, after=None, resume=False, fields=None, raw=False
+    ):
+        """Lazily page through a user's posts and comments.
+
+        Returns an AsyncListing yielding the same items as scrape_user_data, one
+        page at a time; its ``after`` attribute is the cursor of the next
+        page and can be passed back in to resume. With a checkpoint store
+        configured, ``resume=True`` continues from the last saved cursor.
+        """
+        path = f"/user/{username}/overview"
+        parsers, typed = self._parsers_for(fields, raw)
+
+        async def fetch_page(after, page_limit):
+            params = {"limit": page_limit, "after": after}
+            data = await self._get_json(path, params, typed)
+            return self._user_page(data, parsers, username)
+
+        return AsyncListing(
+            fetch_page,
+            limit,
+            after,
+            checkpoint=self._checkpoint(path, resume=resume),
+            resume=resume,
+        )
+
+    async def fetch_subreddit_posts(
+        self,
+        subreddit,
+        limit=10,
+        category="hot",
+        time_filter="all",
+        resume=False,
+        fields=None,
+        raw=False,
+    ):
+        logger.info(
+            "Fetching subreddit/user posts for %s, limit: %d, category: %s, time_filter: %s",
+            subreddit,
+            limit,
+            category,
+            time_filter,
+        )
+        listing = self.iter_subreddit_posts(
+            subreddit,
+            limit,
+            category,
+            time_filter,
+            resume=resume,
+            fields=fields,
+            raw=raw,
+        )
+        all_posts = [post async for post in listing]
+        logger.info("Fetched %d posts for %s", len(all_posts), subreddit)
+        return all_posts
+
+    def iter_subreddit_posts(
+        self,
+        subreddit,
+        limit=10,
+        category="hot",
+        time_filter="all",
+        after=None,
+        resume=False,
+        fields=None,
+        raw=False,
+    ):
+        """Lazily page through a subreddit's (or user's) posts.
+
+        Takes the same arguments as fetch_subreddit_posts and returns an
+        AsyncListing that fetches one page per 100 posts as it is iterated; its
+        ``after`` attribute is the cursor of the next page and can be
+        passed back in to resume. With a checkpoint store configured,
+        ``resume=True`` continues from the last saved cursor.
+        """
+        parsers, typed = self._parsers_for(fields, raw)
+        return self._iter_listing(
+            subreddit,
+            limit,
+            category,
+            time_filter,
+            after,
+            resume,
+            parsers.listing_post,
+            typed,
+        )
+
+    def _iter_listing(
+        self, subreddit, limit, category, time_filter, after, resume, parse, typed=True
+    ):
+        path, shared, checkpoint = self._listing_request(
+            subreddit, category, time_filter, resume
+        )
+
+        async def fetch_page(after, page_limit):
+            params = {"limit": page_limit, "after": after, **shared}
+            data = await self._get_json(path, params, typed)
+            if data is None:
+                return None
+            return parse_listing_page(data, parse)
+
+        return AsyncListing(
+            fetch_page, limit, after, checkpoint=checkpoint, resume=resume
+        )
+
+    async def fetch_subreddit_batch(
+        self, subreddit, limit=10, category="hot", time_filter="all", resume=False
+    ):
+        """Fetch posts like fetch_subreddit_posts, into a columnar PostBatch.
+
+        Each page's raw post data goes straight into the batch's typed
+        columns without building per-post dicts or records; see
+        yars.columns for the numpy and Arrow exports.
+        """
+        listing = self._iter_listing(
+            subreddit, limit, category, time_filter, None, resume, listing_post_data
+        )
+        batch = PostBatch()
+        async for page in listing.pages():
+            batch.extend(page)
+        logger.info("Fetched %d posts for %s", len(batch), subreddit)
+        return batch
+
+    def fetch_many_subreddits(
+        self,
+        subreddits,
+        category="hot",
+        time_filter="all",
+        limit=10,
+        max_workers=8,
+        fields=None,
+        raw=False,
+    ):
+        """Crawl many subreddits at once, async-yielding posts as they arrive.
+
+        Same semantics as YARS.fetch_many_subreddits.
+        """
+        sources = [
+            (
+                name,
+                self.iter_subreddit_posts(
+                    name, limit, category, time_filter, fields=fields, raw=raw
+                ).pages(),
+            )
+            for name in subreddits
+        ]
+        return async_flatten_pages(async_interleave(sources, max_workers))
+
+    async def fetch_posts_by_id(self, ids, fields=None, raw=False):
+        """Fetch metadata for many posts, up to 100 per request.
+
+        ``ids`` are post ids ("1frb5ib") or fullnames ("t3_1frb5ib"). Uses
+        Reddit's /api/info endpoint (the batched equivalent of /by_id) and
+        returns posts in the same shape as fetch_subreddit_posts; posts that
+        no longer exist are skipped.
+        """
+        ids = list(ids)
+        parsers, typed = self._parsers_for(fields, raw)
+        all_posts = []
+        for batch in chunk_fullnames(ids):
+            params = {"id": ",".join(batch), "raw_json": 1}
+            data = await self._get_json("/api/info", params, typed)
+            all_posts.extend(self._info_posts(data, parsers))
+
+        logger.info("Fetched %d of %d posts by id", len(all_posts), len(ids))
+        return all_posts
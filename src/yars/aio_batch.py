@@ -0,0 +1,92 @@
+"""Async counterparts of yars.batch, for AsyncYARS.
+
+Kept apart from yars.batch so only the async client pays for importing
+asyncio.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from itertools import islice
+
+from .batch import _DONE, QUEUE_FACTOR, BatchResult, _outcome
+
+
+async def async_fan_out(fn, items, max_workers=8, ordered=True):
+    """Async counterpart of fan_out for a coroutine function ``fn``."""
+    items = iter(items)
+    window = max_workers * QUEUE_FACTOR
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+
+    def submit(item):
+        return asyncio.ensure_future(run(item))
+
+    pending = deque((item, submit(item)) for item in islice(items, window))
+    try:
+        if ordered:
+            while pending:
+                item, task = pending.popleft()
+                for next_item in islice(items, 1):
+                    pending.append((next_item, submit(next_item)))
+                await asyncio.wait([task])
+                yield _outcome(item, task)
+        else:
+            while pending:
+                by_task = {task: item for item, task in pending}
+                done, _ = await asyncio.wait(
+                    by_task, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending = deque(
+                    (item, task) for item, task in pending if task not in done
+                )
+                for task in done:
+                    for next_item in islice(items, 1):
+                        pending.append((next_item, submit(next_item)))
+                    yield _outcome(by_task[task], task)
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+async def async_flatten_pages(results):
+    async for result in results:
+        if result.error is not None:
+            yield result
+            continue
+        for value in result.value:
+            yield result._replace(value=value)
+
+
+async def async_interleave(sources, max_workers=8):
+    """Async counterpart of interleave for async-iterable ``pages``."""
+    sources = list(sources)
+    results = asyncio.Queue(maxsize=max_workers * QUEUE_FACTOR)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def drain(key, pages):
+        try:
+            async with semaphore:
+                async for page in pages:
+                    await results.put(BatchResult(key, page, None))
+        except Exception as e:
+            await results.put(BatchResult(key, None, e))
+        finally:
+            await results.put(_DONE)
+
+    tasks = [asyncio.ensure_future(drain(key, pages)) for key, pages in sources]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            result = await results.get()
+            if result is _DONE:
+                remaining -= 1
+            else:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,128 @@
+"""Bounded fan-out of scraper calls over many inputs.
+
+``fan_out`` runs a function over an iterable on a thread pool, keeping at
+most a few tasks queued per worker so huge inputs are consumed lazily, and
+yields one BatchResult per input. An exception only fails its own item.
+
+``interleave`` drains several paginated sources at once and streams their
+pages back as they arrive, so one source's wait for the rate limiter is
+spent fetching another.
+
+The asyncio counterparts live in yars.aio_batch, so importing yars doesn't
+import asyncio.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+BatchResult = namedtuple("BatchResult", "item value error")
+BatchResult.__doc__ = """Outcome for one input: ``value`` on success, else ``error``."""
+
+# Tasks queued per worker; keeps workers busy without reading all input.
+QUEUE_FACTOR = 2
+
+_DONE = object()
+
+
+def _outcome(item, future):
+    error = future.exception()
+    if error is not None:
+        return BatchResult(item, None, error)
+    return BatchResult(item, future.result(), None)
+
+
+def fan_out(fn, items, max_workers=8, ordered=True):
+    """Yield ``BatchResult(item, fn(item), error)`` for every item.
+
+    Results come back in input order when ``ordered`` is true, otherwise
+    as soon as each call completes.
+    """
+    items = iter(items)
+    window = max_workers * QUEUE_FACTOR
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if ordered:
+            pending = deque(
+                (item, pool.submit(fn, item)) for item in islice(items, window)
+            )
+            while pending:
+                item, future = pending.popleft()
+                for next_item in islice(items, 1):
+                    pending.append((next_item, pool.submit(fn, next_item)))
+                wait([future])
+                yield _outcome(item, future)
+        else:
+            pending = {pool.submit(fn, item): item for item in islice(items, window)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    for next_item in islice(items, 1):
+                        pending[pool.submit(fn, next_item)] = next_item
+                    yield _outcome(item, future)
+    finally:
+        # Also runs when the caller stops iterating early.
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def flatten_pages(results):
+    """Turn per-page BatchResults into one BatchResult per item."""
+    for result in results:
+        if result.error is not None:
+            yield result
+            continue
+        for value in result.value:
+            yield result._replace(value=value)
+
+
+def interleave(sources, max_workers=8):
+    """Drain ``(key, pages)`` sources concurrently, yielding tagged pages.
+
+    ``pages`` is an iterable of lists (e.g. ``Listing.pages()``). Yields
+    ``BatchResult(key, page, None)`` for each page as soon as it is
+    fetched, and ``BatchResult(key, None, error)`` if a source raises. At
+    most ``max_workers`` sources are read at once, and only a few fetched
+    pages are buffered ahead of the caller.
+    """
+    sources = list(sources)
+    results = queue.Queue(maxsize=max_workers * QUEUE_FACTOR)
+    stop = threading.Event()
+
+    def put(result):
+        while not stop.is_set():
+            try:
+                results.put(result, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(key, pages):
+        try:
+            for page in pages:
+                if stop.is_set() or not put(BatchResult(key, page, None)):
+                    return
+        except Exception as e:
+            put(BatchResult(key, None, e))
+        finally:
+            put(_DONE)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for key, pages in sources:
+            pool.submit(drain, key, pages)
+        remaining = len(sources)
+        while remaining:
+            result = results.get()
+            if result is _DONE:
+                remaining -= 1
+            else:
+                yield result
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,157 @@
+"""Circuit breakers that stop calling Reddit endpoints that keep failing.
+
+Calls are grouped by host and endpoint family (listing, search, comments,
+user). After ``failure_threshold`` consecutive failed calls a circuit opens
+and further calls fail immediately with CircuitOpenError instead of
+sitting through retries, so a crawl that runs into one fails visibly
+rather than looking finished. After ``cooldown`` seconds it half-opens: a few probe calls go through, and
+the first result decides whether it closes again or reopens. Probes that
+never report back (e.g. a cancelled task) stop blocking the circuit after
+another ``cooldown``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+BreakerState = namedtuple("BreakerState", "host family state failures retry_in")
+BreakerState.__doc__ = (
+    """Snapshot of one circuit; ``retry_in`` is seconds until it half-opens."""
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """A call was refused because its endpoint's circuit is open."""
+
+    def __init__(self, key, url):
+        super().__init__(f"circuit for {key[0]} {key[1]} is open, skipped {url}")
+        self.key = key
+        self.url = url
+
+
+_FAMILIES = (
+    (re.compile(r"(^|/)search(\.json)?$"), "search"),
+    (re.compile(r"/comments/|^/api/morechildren"), "comments"),
+    (re.compile(r"^/user/"), "user"),
+)
+
+
+def endpoint_family(path):
+    """Endpoint family of a Reddit API path, e.g. 'search' for /r/x/search."""
+    for pattern, family in _FAMILIES:
+        if pattern.search(path):
+            return family
+    return "listing"
+
+
+def breaker_key(url, path):
+    return urlsplit(url).hostname, endpoint_family(path)
+
+
+def is_failure(status):
+    """Whether a call ending with ``status`` (None: no response) counts as failed.
+
+    Server errors and throttling do; 403s (private or quarantined
+    subreddits), 404s and other client errors are about the request, not
+    the endpoint's health.
+    """
+    return status is None or status >= 500 or status == 429
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probes", "probed_at")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probed_at = 0.0
+
+
+class CircuitBreaker:
+    """Per ``(host, family)`` circuits, safe to share across threads."""
+
+    __slots__ = (
+        "failure_threshold",
+        "cooldown",
+        "half_open_probes",
+        "clock",
+        "_circuits",
+        "_lock",
+    )
+
+    def __init__(
+        self, failure_threshold=5, cooldown=30, half_open_probes=1, clock=time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Whether a call for ``key`` may proceed.
+
+        An allowed call must be followed by record(), or by release() if it
+        ended without an outcome.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            now = self.clock()
+            if circuit.state == OPEN:
+                if now - circuit.opened_at < self.cooldown:
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_probes:
+                    if now - circuit.probed_at < self.cooldown:
+                        return False
+                    circuit.probes = 0  # the probes never reported back
+                circuit.probes += 1
+                circuit.probed_at = now
+            return True
+
+    def release(self, key):
+        """Return the slot of an allowed call that ended without an outcome."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    def record(self, key, success):
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if success:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = self.clock()
+
+    def state(self, key):
+        with self._lock:
+            return self._snapshot(key, self._circuits.get(key) or _Circuit())
+
+    def states(self):
+        """BreakerState for every circuit that has seen a call."""
+        with self._lock:
+            return [self._snapshot(k, c) for k, c in self._circuits.items()]
+
+    def _snapshot(self, key, circuit):
+        retry_in = 0.0
+        if circuit.state == OPEN:
+            retry_in = max(0.0, circuit.opened_at + self.cooldown - self.clock())
+        return BreakerState(*key, circuit.state, circuit.failures, retry_in)
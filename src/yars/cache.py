@@ -0,0 +1,243 @@
+"""Response caches.
+
+ResponseCache stores raw response bodies in SQLite, keyed by auth mode,
+path and sorted query parameters. Entries stay fresh for a TTL chosen per
+endpoint (see ``default_ttl``); once stale they are revalidated with
+If-None-Match / If-Modified-Since when Reddit sent an ETag or
+Last-Modified header, and refetched otherwise.
+
+LRUCache is a bounded in-process cache for parsed results, so repeated
+calls within one job don't refetch the same post or user.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlencode
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# TTL of top/controversial listings by their time filter: a year-long
+# ranking barely moves within a day, an hourly one does.
+TIME_FILTER_TTLS = {
+    "hour": 5 * MINUTE,
+    "day": 30 * MINUTE,
+    "week": 2 * HOUR,
+    "month": 6 * HOUR,
+    "year": DAY,
+    "all": DAY,
+}
+
+_SORT_TTLS = (
+    (re.compile(r"/(new|rising)$"), MINUTE),
+    (re.compile(r"/hot$"), 5 * MINUTE),
+    (re.compile(r"/comments/"), 10 * MINUTE),
+    (re.compile(r"/api/morechildren$"), 10 * MINUTE),
+    (re.compile(r"/search$"), 10 * MINUTE),
+    (re.compile(r"^/user/"), 15 * MINUTE),
+)
+
+CacheStats = namedtuple("CacheStats", "hits misses evictions entries bytes")
+
+CachedResponse = namedtuple(
+    "CachedResponse", "body etag last_modified stored_at expires_at"
+)
+
+
+def default_ttl(path, params=None):
+    """Seconds a response for ``path``/``params`` stays fresh."""
+    params = params or {}
+    if re.search(r"/(top|controversial)$", path) or params.get("sort") in (
+        "top",
+        "controversial",
+    ):
+        return TIME_FILTER_TTLS.get(params.get("t", "all"), HOUR)
+    for pattern, ttl in _SORT_TTLS:
+        if pattern.search(path):
+            return ttl
+    return 5 * MINUTE
+
+
+def cache_key(mode, path, params=None):
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    return f"{mode}:{path}?{urlencode(sorted(params.items()))}"
+
+
+class ResponseCache:
+    """SQLite-backed response cache, safe to share across threads.
+
+    ``ttl`` is a number of seconds or a ``callable(path, params)`` returning
+    one; a TTL of 0 or less disables caching for that request.
+    """
+
+    __slots__ = ("path", "ttl", "_conn", "_lock")
+
+    def __init__(self, path="yars_cache.sqlite3", ttl=default_ttl):
+        self.path = path
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body BLOB, etag TEXT, last_modified TEXT, "
+                "stored_at REAL, expires_at REAL)"
+            )
+
+    def ttl_for(self, path, params=None):
+        return self.ttl(path, params) if callable(self.ttl) else self.ttl
+
+    def get(self, key):
+        """Return the CachedResponse for ``key`` (fresh or stale), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, key, body, ttl, etag=None, last_modified=None):
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now, now + ttl),
+            )
+
+    def refresh(self, key, ttl):
+        """Extend a revalidated (304) entry's lifetime by ``ttl`` seconds."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ? WHERE key = ?",
+                (time.time() + ttl, key),
+            )
+
+    def purge_expired(self):
+        """Drop stale entries that cannot be revalidated; return how many."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at < ? "
+                "AND etag IS NULL AND last_modified IS NULL",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        self._conn.close()
+
+
+def is_fresh(entry):
+    return entry is not None and entry.expires_at > time.time()
+
+
+def conditional_headers(entry):
+    """Revalidation headers for a stale entry, or None if it has no validators."""
+    if entry is None:
+        return None
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers or None
+
+
+def json_size(value):
+    """Rough in-memory footprint of a parsed result: its JSON length."""
+    return len(json.dumps(value, default=str))
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and, optionally, bytes.
+
+    Entries older than ``ttl`` seconds are treated as misses. Byte sizes
+    come from ``sizeof(value)`` and are only computed when ``maxbytes`` is
+    set. Cached values are returned as-is, so callers should treat them as
+    read-only.
+    """
+
+    __slots__ = (
+        "maxsize",
+        "maxbytes",
+        "ttl",
+        "sizeof",
+        "hits",
+        "misses",
+        "evictions",
+        "_data",
+        "_bytes",
+        "_lock",
+    )
+
+    def __init__(self, maxsize=1024, maxbytes=None, ttl=None, sizeof=json_size):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl is not None:
+                if time.monotonic() - item[2] > self.ttl:
+                    self._pop(key)
+                    item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self._bytes > self.maxbytes
+            ):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _pop(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                self.hits, self.misses, self.evictions, len(self._data), self._bytes
+            )
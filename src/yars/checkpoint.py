@@ -0,0 +1,88 @@
+"""Resumable pagination checkpoints.
+
+A CheckpointStore remembers, for each listing (keyed by path and
+parameters), the ``after`` cursor and item count reached so far. Listings
+save after every page the caller has finished with and forget the entry
+once the crawl completes, so a crawl that dies on page 20 can continue
+from page 21 with ``resume=True``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+
+def checkpoint_key(path, params=None):
+    """Stable key for a listing: its path plus sorted static parameters."""
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
+
+
+class CheckpointStore:
+    """SQLite-backed store of listing cursors, safe to share across threads."""
+
+    __slots__ = ("path", "_conn", "_lock")
+
+    def __init__(self, path="yars_checkpoints.sqlite3"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "key TEXT PRIMARY KEY, after TEXT, count INTEGER, updated_at REAL)"
+            )
+
+    def load(self, key):
+        """Return ``(after, count)`` saved for ``key``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT after, count FROM checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def save(self, key, after, count):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                (key, after, count, time.time()),
+            )
+
+    def clear(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+
+    def keys(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM checkpoints").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        self._conn.close()
+
+    def checkpoint(self, key):
+        return Checkpoint(self, key)
+
+
+class Checkpoint:
+    """One listing's entry in a CheckpointStore."""
+
+    __slots__ = ("store", "key")
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+
+    def load(self):
+        return self.store.load(self.key)
+
+    def save(self, after, count):
+        self.store.save(self.key, after, count)
+
+    def clear(self):
+        self.store.clear(self.key)
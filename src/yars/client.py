@@ -0,0 +1,288 @@
+"""State and bookkeeping shared by the YARS and AsyncYARS clients.
+
+BaseClient holds everything that does no I/O: configuration, URLs, cache
+keys, circuit-breaker and rate-budget bookkeeping, parser selection and
+the request parameters and post-processing of each endpoint. The two
+clients add only their transport and the methods that send requests, so
+this module imports neither requests nor httpx nor asyncio.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from .breaker import CircuitBreaker, CircuitOpenError, breaker_key, is_failure
+from .cache import LRUCache, ResponseCache, cache_key
+from .checkpoint import CheckpointStore, checkpoint_key
+from .credentials import credential_pool
+from .decoders import get_decoder, schema_covers
+from .parsers import (
+    DICT_PARSERS,
+    RAW_PARSERS,
+    listing_path,
+    parse_listing_page,
+    parse_post_details,
+    parse_search_results,
+    projected_parsers,
+)
+from .proxies import proxy_pool
+from .ratelimit import RateLimiter, combine_budgets, parse_ratelimit_headers
+from .records import RECORD_PARSERS
+from .retry import DEFAULT_RETRY, DEFAULT_TOKEN_RETRY
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+DEFAULT_OAUTH_USER_AGENT = "yars/0.1 (Reddit data scraper)"
+
+
+class BaseClient:
+    """Transport-independent part of a Reddit client; see YARS."""
+
+    __slots__ = (
+        "proxy",
+        "proxy_pool",
+        "timeout",
+        "retry",
+        "token_retry",
+        "rate_limiter",
+        "breaker",
+        "decoder",
+        "parsers",
+        "checkpoints",
+        "cache",
+        "memory_cache",
+        "credentials",
+    )
+
+    def __init__(
+        self,
+        proxy=None,
+        timeout=10,
+        client_id=None,
+        client_secret=None,
+        rate_limiter=None,
+        checkpoints=None,
+        cache=None,
+        memory_cache=None,
+        credentials=None,
+        retry=None,
+        token_retry=None,
+        breaker=None,
+        decoder="auto",
+        records=False,
+    ):
+        self.credentials = credential_pool(client_id, client_secret, credentials)
+        self.proxy = proxy
+        self.proxy_pool = proxy_pool(proxy)
+        self.timeout = timeout
+        self.retry = DEFAULT_RETRY if retry is None else retry
+        self.token_retry = DEFAULT_TOKEN_RETRY if token_retry is None else token_retry
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.decoder = get_decoder(decoder)
+        self.parsers = RECORD_PARSERS if records else DICT_PARSERS
+        if isinstance(checkpoints, (str, os.PathLike)):
+            checkpoints = CheckpointStore(checkpoints)
+        self.checkpoints = checkpoints
+        if isinstance(cache, (str, os.PathLike)):
+            cache = ResponseCache(cache)
+        self.cache = cache
+        if isinstance(memory_cache, int) and not isinstance(memory_cache, bool):
+            memory_cache = LRUCache(maxsize=memory_cache)
+        self.memory_cache = memory_cache
+
+    def _checkpoint(self, path, params=None, resume=False):
+        if self.checkpoints is None:
+            if resume:
+                raise ValueError("resume=True needs a checkpoint store (checkpoints=)")
+            return None
+        return self.checkpoints.checkpoint(checkpoint_key(path, params))
+
+    def _url(self, path):
+        """Build the full URL for a Reddit API path like '/r/python/hot'."""
+        if self.credentials:
+            return f"https://oauth.reddit.com{path}"
+        return f"https://www.reddit.com{path}.json"
+
+    @property
+    def _mode(self):
+        return "oauth" if self.credentials else "anonymous"
+
+    def _record_budget(self, response, credential=None):
+        """Feed Reddit's X-Ratelimit-* headers back into the rate limiter."""
+        budget = parse_ratelimit_headers(response.headers)
+        if budget is None:
+            return
+        if credential is not None:
+            self.credentials.update(credential, budget)
+        update = getattr(self.rate_limiter, "update", None)
+        if update is not None:
+            update(self._mode, budget, credential.client_id if credential else None)
+
+    @property
+    def rate_limit_budget(self):
+        """Last RateLimitBudget (used, remaining, reset_at) Reddit reported.
+
+        Summed over all credentials in OAuth mode. None until a response
+        carrying X-Ratelimit headers has been seen, or when the rate limiter
+        does not track budgets.
+        """
+        budget = getattr(self.rate_limiter, "budget", None)
+        if not budget:
+            return None
+        if not self.credentials:
+            return budget(self._mode)
+        return combine_budgets(
+            budget(self._mode, c.client_id) for c in self.credentials
+        )
+
+    @property
+    def proxy_stats(self):
+        """ProxyStats for every proxy in the pool, or None without a pool."""
+        return self.proxy_pool.stats() if self.proxy_pool else None
+
+    @property
+    def breaker_states(self):
+        """BreakerState of every endpoint circuit, or None without a breaker."""
+        return self.breaker.states() if self.breaker else None
+
+    def _allow(self, url, path):
+        """Return the breaker key for a call; raise if its circuit is open."""
+        if not self.breaker:
+            return None
+        circuit = breaker_key(url, path)
+        if not self.breaker.allow(circuit):
+            logger.warning("Circuit for %s %s is open, skipping %s", *circuit, url)
+            raise CircuitOpenError(circuit, url)
+        return circuit
+
+    def _record_outcome(self, circuit, status):
+        if circuit:
+            self.breaker.record(circuit, not is_failure(status))
+
+    def _release(self, circuit):
+        if circuit:
+            self.breaker.release(circuit)
+
+    def _cache_lookup(self, path, params):
+        """Return (key, entry) for a request, or (None, None) without a cache."""
+        if self.cache is None:
+            return None, None
+        key = cache_key(self._mode, path, params)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key, path, params, response):
+        if key is None:
+            return
+        self.cache.put(
+            key,
+            response.content,
+            self.cache.ttl_for(path, params),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _parsers_for(self, fields, raw):
+        """Return ``(parsers, typed)`` for a call's ``fields``/``raw`` options.
+
+        ``typed`` is False when the decoder's schemas would drop fields the
+        parsers need.
+        """
+        if raw:
+            if fields is not None:
+                raise ValueError("pass either fields or raw=True, not both")
+            return RAW_PARSERS, False
+        if fields is None:
+            return self.parsers, True
+        return projected_parsers(fields), schema_covers(fields)
+
+    @staticmethod
+    def _search_results(data, parsers, fields, raw):
+        if data is None:
+            return []
+        if fields is None and not raw:
+            return parse_search_results(data)
+        return parse_search_results(data, parsers.listing_post)
+
+    @staticmethod
+    def _parse_thread(post_data, path, expand_more, parsers, fields):
+        """Parse a thread payload into ``(details, pending)``.
+
+        ``pending`` is None, or the ``(link_id, comments, index, more)``
+        arguments of _expand_more when ``expand_more`` found stubs to load.
+        """
+        # Without fields, a thread keeps its title/body summary.
+        post = None if fields is None else parsers.post
+        if not expand_more:
+            details = parse_post_details(
+                post_data, path, comment=parsers.comment, post=post
+            )
+            return details, None
+
+        index, more = {}, []
+        details = parse_post_details(
+            post_data, path, index, more, parsers.comment, post
+        )
+        if details is None or not more:
+            return details, None
+        main_post = post_data[0]["data"]["children"][0]["data"]
+        link_id = main_post.get("name") or f"t3_{main_post['id']}"
+        return details, (link_id, details["comments"], index, more)
+
+    @staticmethod
+    def _comment_listing(post_data, path):
+        """Return the comment listing children of a thread, or None."""
+        if not isinstance(post_data, list) or len(post_data) < 2:
+            if post_data is not None:
+                logger.warning("Unexpected post data structure for %s", path)
+            return None
+        return post_data[1]["data"]["children"]
+
+    @staticmethod
+    def _more_children_params(link_id, ids):
+        return {
+            "api_type": "json",
+            "link_id": link_id,
+            "children": ",".join(ids),
+            "limit_children": "false",
+            "raw_json": 1,
+        }
+
+    @staticmethod
+    def _more_children_things(data):
+        if data is None:
+            return []
+        return data.get("json", {}).get("data", {}).get("things", [])
+
+    @staticmethod
+    def _user_page(data, parsers, username):
+        if data is None:
+            return None
+        page = parse_listing_page(data, parsers.user_item)
+        if page is None:
+            logger.warning("Unexpected response shape for user %s", username)
+        return page
+
+    def _listing_request(self, subreddit, category, time_filter, resume):
+        """Return ``(path, params, checkpoint)`` for a subreddit listing.
+
+        ``params`` are the query parameters every page shares; callers add
+        ``limit`` and ``after``.
+        """
+        path, params_extra = listing_path(subreddit, category, time_filter)
+        checkpoint = self._checkpoint(path, {"t": time_filter, **params_extra}, resume)
+        params = {"raw_json": 1, "t": time_filter, **params_extra}
+        return path, params, checkpoint
+
+    @staticmethod
+    def _info_posts(data, parsers):
+        """The posts (t3 children) of an /api/info response."""
+        if data is None:
+            return []
+        return [
+            parsers.listing_post(post)
+            for post in data.get("data", {}).get("children", [])
+            if post.get("kind") == "t3"
+        ]
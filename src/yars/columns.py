@@ -0,0 +1,409 @@
+"""Columnar post and comment results for analytics.
+
+A PostBatch accumulates listing posts straight from Reddit's ``data``
+dicts into one column per field: ``score``, ``num_comments`` and
+``created_utc`` in typed ``array`` buffers, strings in lists (authors
+interned). No per-post dict is ever built. ``to_numpy()`` and
+``to_arrow()`` wrap the numeric buffers without copying them, ready for
+vectorised arithmetic or ``pyarrow.parquet.write_table``. numpy and
+pyarrow are optional and only imported by those methods.
+
+A CommentTree does the same for a thread: parallel arrays of parent
+index, depth, score and author id in depth-first order, with every
+subtree a contiguous slice. Top-k, subtree sums, depth histograms and
+per-author totals then run over flat arrays instead of recursive walks
+of the nested ``replies`` dicts: vectorised with numpy when it is
+installed, as plain loops over the arrays otherwise.
+benchmarks/bench_comment_tree.py times both.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+from array import array
+from collections import Counter, namedtuple
+from functools import cache
+from importlib.util import find_spec
+from itertools import accumulate
+from operator import add
+
+from .parsers import image_url, thumbnail_url
+
+# Column name -> array typecode for numeric columns.
+NUMERIC_COLUMNS = {"score": "q", "num_comments": "q", "created_utc": "d"}
+STRING_COLUMNS = (
+    "title",
+    "author",
+    "subreddit",
+    "permalink",
+    "body",
+    "image_url",
+    "thumbnail_url",
+)
+COLUMNS = tuple(NUMERIC_COLUMNS) + STRING_COLUMNS
+# Trees smaller than this aren't worth numpy's per-call overhead.
+NUMPY_MIN_SIZE = 1000
+
+
+@cache
+def _numpy():
+    """numpy if it is installed, else None; imported on first use."""
+    if find_spec("numpy") is None:
+        return None
+    import numpy
+
+    return numpy
+
+
+class PostBatch:
+    """Column store of posts; the values match parsers.parse_post.
+
+    Adds a ``subreddit`` column; ``image_url``/``thumbnail_url`` hold None
+    where a post has none. ``len(batch)`` is the number of posts and
+    ``batch[i]`` rebuilds one post as a dict. While numpy or Arrow views
+    of a batch are alive, appending to it raises BufferError.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self):
+        for name, typecode in NUMERIC_COLUMNS.items():
+            setattr(self, name, array(typecode))
+        for name in STRING_COLUMNS:
+            setattr(self, name, [])
+
+    def __len__(self):
+        return len(self.score)
+
+    def __repr__(self):
+        return f"PostBatch({len(self)} posts)"
+
+    def append(self, post_data):
+        """Add one post from a t3 ``data`` dict.
+
+        Every value is read before any column grows, and a value a typed
+        column rejects rolls the others back, so a malformed post raises
+        and leaves the batch unchanged.
+        """
+        score = post_data["score"]
+        num_comments = post_data["num_comments"]
+        created_utc = post_data["created_utc"]
+        title = post_data["title"]
+        author = sys.intern(post_data["author"])
+        subreddit = sys.intern(post_data.get("subreddit", ""))
+        permalink = post_data["permalink"]
+        body = post_data.get("selftext", "")
+        image = image_url(post_data)
+        thumbnail = thumbnail_url(post_data)
+
+        n = len(self)
+        try:
+            self.score.append(score)
+            self.num_comments.append(num_comments)
+            self.created_utc.append(created_utc)
+        except (TypeError, OverflowError):
+            for name in NUMERIC_COLUMNS:
+                del getattr(self, name)[n:]
+            raise
+        self.title.append(title)
+        self.author.append(author)
+        self.subreddit.append(subreddit)
+        self.permalink.append(permalink)
+        self.body.append(body)
+        self.image_url.append(image)
+        self.thumbnail_url.append(thumbnail)
+
+    def extend(self, posts):
+        for post_data in posts:
+            self.append(post_data)
+
+    def __getitem__(self, i):
+        return {name: getattr(self, name)[i] for name in COLUMNS}
+
+    def columns(self):
+        """Mapping of column name to its array or list."""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def to_numpy(self):
+        """Columns as numpy arrays; numeric ones share the batch's memory."""
+        import numpy as np
+
+        result = {
+            name: np.frombuffer(getattr(self, name), dtype=typecode)
+            for name, typecode in NUMERIC_COLUMNS.items()
+        }
+        for name in STRING_COLUMNS:
+            result[name] = np.array(getattr(self, name), dtype=object)
+        return result
+
+    def to_arrow(self):
+        """A pyarrow.Table; numeric columns reuse the batch's buffers."""
+        import pyarrow as pa
+
+        types = {"q": pa.int64(), "d": pa.float64()}
+        arrays = [
+            pa.Array.from_buffers(
+                types[typecode],
+                len(self),
+                [None, pa.py_buffer(getattr(self, name))],
+            )
+            for name, typecode in NUMERIC_COLUMNS.items()
+        ]
+        arrays += [
+            pa.array(getattr(self, name), pa.string()) for name in STRING_COLUMNS
+        ]
+        return pa.Table.from_arrays(arrays, names=list(COLUMNS))
+
+
+def listing_post_data(child):
+    """Listing-page parser that keeps a t3 child's raw ``data`` dict."""
+    return child["data"]
+
+
+AuthorTotal = namedtuple("AuthorTotal", "comments score")
+
+
+class CommentTree:
+    """A comment thread as parallel arrays in depth-first order.
+
+    Comment ``i`` is followed by all of its replies, so its subtree is
+    ``subtree(i)``, a contiguous range. ``parent[i]`` is the parent's
+    index (-1 for top-level comments), ``author[i]`` indexes ``authors``
+    and ``body(i)`` slices one shared string at ``offsets[i]``. Build one
+    with from_listing (raw thread children) or from_comments (the nested
+    dicts or records of scrape_post_details).
+    """
+
+    __slots__ = (
+        "parent",
+        "depth",
+        "score",
+        "author",
+        "authors",
+        "offsets",
+        "_bodies",
+        "_author_ids",
+        "_ends",
+    )
+
+    def __init__(self):
+        self.parent = array("q")
+        self.depth = array("i")
+        self.score = array("q")
+        self.author = array("i")
+        self.authors = []
+        self.offsets = array("q", [0])
+        self._bodies = []
+        self._author_ids = {}
+        self._ends = None
+
+    @classmethod
+    def from_listing(cls, children):
+        """Build from the ``children`` of a thread's comment listing."""
+        tree = cls()
+        stack = [(iter(children), -1, 0)]
+        while stack:
+            children, parent, depth = stack[-1]
+            for child in children:
+                if not isinstance(child, dict) or child.get("kind") != "t1":
+                    continue
+                data = child.get("data", {})
+                index = tree._append(
+                    parent,
+                    depth,
+                    data.get("author", ""),
+                    data.get("body", ""),
+                    data.get("score", 0),
+                )
+                replies = data.get("replies", "")
+                if isinstance(replies, dict):
+                    stack.append(
+                        (
+                            iter(replies.get("data", {}).get("children", [])),
+                            index,
+                            depth + 1,
+                        )
+                    )
+                    break
+            else:
+                stack.pop()
+        return tree._finish()
+
+    @classmethod
+    def from_comments(cls, comments):
+        """Build from nested comment dicts or records.Comment objects."""
+        tree = cls()
+        stack = [(iter(comments), -1, 0)]
+        while stack:
+            comments, parent, depth = stack[-1]
+            for comment in comments:
+                index = tree._append(
+                    parent, depth, comment["author"], comment["body"], comment["score"]
+                )
+                if comment["replies"]:
+                    stack.append((iter(comment["replies"]), index, depth + 1))
+                    break
+            else:
+                stack.pop()
+        return tree._finish()
+
+    def _append(self, parent, depth, author, body, score):
+        author_id = self._author_ids.get(author)
+        if author_id is None:
+            author_id = self._author_ids[author] = len(self.authors)
+            self.authors.append(author)
+        self.parent.append(parent)
+        self.depth.append(depth)
+        self.score.append(score)
+        self.author.append(author_id)
+        self._bodies.append(body)
+        return len(self.score) - 1
+
+    def _finish(self):
+        self.offsets = array("q", accumulate(map(len, self._bodies), initial=0))
+        self._bodies = "".join(self._bodies)
+        return self
+
+    def __len__(self):
+        return len(self.score)
+
+    def __repr__(self):
+        return f"CommentTree({len(self)} comments)"
+
+    def __getitem__(self, i):
+        return {
+            "parent": self.parent[i],
+            "depth": self.depth[i],
+            "author": self.authors[self.author[i]],
+            "body": self.body(i),
+            "score": self.score[i],
+        }
+
+    def body(self, i):
+        return self._bodies[self.offsets[i] : self.offsets[i + 1]]
+
+    def _np(self):
+        """numpy, or None if it is missing or the tree is too small to gain."""
+        return _numpy() if len(self) >= NUMPY_MIN_SIZE else None
+
+    def _view(self, np, values):
+        return np.frombuffer(values, dtype=values.typecode)
+
+    def _sum_up(self, values):
+        """Add each comment's value into its ancestors', deepest first."""
+        totals = array("q", values)
+        np = self._np()
+        if np is not None:
+            # One scatter-add per depth level, from the leaves up.
+            sums = self._view(np, totals)
+            parent = self._view(np, self.parent)
+            by_depth = np.argsort(self._view(np, self.depth), kind="stable")
+            bounds = np.cumsum(np.bincount(self._view(np, self.depth)))
+            for d in range(len(bounds) - 1, 0, -1):
+                level = by_depth[bounds[d - 1] : bounds[d]]
+                np.add.at(sums, parent[level], sums[level])
+            return totals
+        parent = self.parent
+        for i in range(len(totals) - 1, -1, -1):
+            p = parent[i]
+            if p >= 0:
+                totals[p] += totals[i]
+        return totals
+
+    def subtree_sizes(self):
+        """Number of comments in each comment's subtree, itself included."""
+        return self._sum_up(array("q", [1]) * len(self))
+
+    def subtree_scores(self):
+        """Total score of each comment's subtree, itself included."""
+        return self._sum_up(self.score)
+
+    def subtree(self, i):
+        """Indices of comment i and all of its replies."""
+        if self._ends is None:
+            sizes = self.subtree_sizes()
+            np = self._np()
+            if np is not None:
+                ends = self._view(np, sizes) + np.arange(len(self))
+                self._ends = array("q", ends.tobytes())
+            else:
+                self._ends = array("q", map(add, sizes, range(len(self))))
+        return range(i, self._ends[i])
+
+    def children(self, i):
+        """Indices of comment i's direct replies."""
+        replies = self.subtree(i)[1:]
+        np = self._np()
+        if np is not None:
+            parent = self._view(np, self.parent)[replies.start : replies.stop]
+            return (np.flatnonzero(parent == i) + replies.start).tolist()
+        parent = self.parent
+        return [j for j in replies if parent[j] == i]
+
+    def top_k(self, k=10, subtree=False):
+        """Indices of the k highest-scoring comments, best first.
+
+        With ``subtree=True`` comments are ranked by subtree_scores. Ties
+        go to the earlier comment.
+        """
+        values = self.subtree_scores() if subtree else self.score
+        np = self._np()
+        if np is None or k <= 0:
+            return heapq.nlargest(k, range(len(self)), key=values.__getitem__)
+        values = self._view(np, values)
+        if k < len(values):
+            # Everything above the k-th largest value, then the earliest ties.
+            kth = np.partition(values, len(values) - k)[len(values) - k]
+            above = np.flatnonzero(values > kth)
+            ties = np.flatnonzero(values == kth)[: k - len(above)]
+            candidates = np.concatenate((above, ties))
+        else:
+            candidates = np.arange(len(values))
+        order = np.lexsort((candidates, -values[candidates]))
+        return candidates[order].tolist()
+
+    def depth_histogram(self):
+        """``hist[d]`` is the number of comments at depth d."""
+        np = self._np()
+        if np is not None:
+            return np.bincount(self._view(np, self.depth)).tolist()
+        counts = Counter(self.depth)
+        return [counts[d] for d in range(max(counts, default=-1) + 1)]
+
+    def author_totals(self):
+        """Mapping of author to AuthorTotal(comments, score)."""
+        np = self._np()
+        if np is not None:
+            author = self._view(np, self.author)
+            counts = np.bincount(author, minlength=len(self.authors)).tolist()
+            scores = np.bincount(
+                author, self._view(np, self.score), minlength=len(self.authors)
+            ).astype(np.int64)
+            return {
+                name: AuthorTotal(count, score)
+                for name, count, score in zip(self.authors, counts, scores.tolist())
+            }
+        counts = Counter(self.author)
+        scores = [0] * len(self.authors)
+        for author_id, score in zip(self.author, self.score):
+            scores[author_id] += score
+        return {
+            self.authors[a]: AuthorTotal(count, scores[a])
+            for a, count in counts.items()
+        }
+
+    def to_numpy(self):
+        """numpy views of the numeric arrays, sharing the tree's memory."""
+        import numpy as np
+
+        return {
+            name: np.frombuffer(values, dtype=values.typecode)
+            for name, values in (
+                ("parent", self.parent),
+                ("depth", self.depth),
+                ("score", self.score),
+                ("author", self.author),
+                ("offsets", self.offsets),
+            )
+        }
@@ -0,0 +1,142 @@
+"""OAuth app credentials and the pool requests are spread over.
+
+Reddit's rate limit applies per OAuth app, so registering several "script"
+apps and pooling them multiplies authenticated throughput. Each Credential
+keeps its own token and remaining budget; CredentialPool hands out the one
+with the most quota left.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+
+# Refresh tokens this many seconds before Reddit says they expire.
+TOKEN_EXPIRY_MARGIN = 60
+
+# Start refreshing in the background this many seconds before that.
+TOKEN_REFRESH_AHEAD = 300
+
+
+class Credential:
+    """One OAuth app's client id/secret, access token and remaining budget.
+
+    ``lock`` is held while the token is being fetched, so concurrent
+    callers wait for one refresh instead of each requesting a token.
+    """
+
+    __slots__ = (
+        "client_id",
+        "client_secret",
+        "token",
+        "token_expiry",
+        "remaining",
+        "reset_at",
+        "sent",
+        "lock",
+    )
+
+    def __init__(self, client_id, client_secret):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token = None
+        self.token_expiry = 0.0
+        self.remaining = None
+        self.reset_at = 0.0
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Credential({self.client_id!r})"
+
+    @property
+    def auth(self):
+        return (self.client_id, self.client_secret)
+
+    def token_valid(self):
+        return (
+            bool(self.token) and time.time() < self.token_expiry - TOKEN_EXPIRY_MARGIN
+        )
+
+    def token_expiring(self):
+        """True once a still-valid token is due for a proactive refresh."""
+        return (
+            bool(self.token)
+            and time.time()
+            >= self.token_expiry - TOKEN_EXPIRY_MARGIN - TOKEN_REFRESH_AHEAD
+        )
+
+    def set_token(self, token, expires_in):
+        self.token = token
+        self.token_expiry = time.time() + expires_in
+
+    @property
+    def headers(self):
+        return {"Authorization": f"bearer {self.token}"}
+
+    def quota(self):
+        """Requests believed to be left in the current window (inf if unknown)."""
+        if self.remaining is None or time.time() >= self.reset_at:
+            return math.inf
+        return self.remaining
+
+
+class CredentialPool:
+    """Credentials that requests are spread over by remaining quota.
+
+    Accepts Credential objects or ``(client_id, client_secret)`` pairs.
+    ``choose()`` picks the credential with the most quota left, counting
+    requests already sent since its last budget report; ties (including
+    before any budget is known) go to the least-used credential.
+    """
+
+    __slots__ = ("credentials", "_lock")
+
+    def __init__(self, credentials):
+        self.credentials = [
+            c if isinstance(c, Credential) else Credential(*c) for c in credentials
+        ]
+        if not self.credentials:
+            raise ValueError("CredentialPool needs at least one credential")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def __iter__(self):
+        return iter(self.credentials)
+
+    def choose(self):
+        with self._lock:
+            credential = max(self.credentials, key=lambda c: (c.quota(), -c.sent))
+            credential.sent += 1
+            if credential.remaining is not None:
+                credential.remaining -= 1
+            return credential
+
+    def update(self, credential, budget):
+        """Record a RateLimitBudget Reddit reported for ``credential``."""
+        with self._lock:
+            credential.remaining = budget.remaining
+            credential.reset_at = budget.reset_at
+
+
+def credential_pool(client_id=None, client_secret=None, credentials=None):
+    """Build the CredentialPool for a client, or None for anonymous mode.
+
+    Combines an explicit ``client_id``/``client_secret`` pair with
+    ``credentials``, which may already be a CredentialPool. Without
+    ``credentials``, the pair falls back to the REDDIT_CLIENT_ID /
+    REDDIT_CLIENT_SECRET env vars.
+    """
+    if isinstance(credentials, CredentialPool):
+        return credentials
+    pool = list(credentials or ())
+    if not pool:
+        client_id = client_id or os.environ.get("REDDIT_CLIENT_ID")
+        client_secret = client_secret or os.environ.get("REDDIT_CLIENT_SECRET")
+    if client_id and client_secret:
+        pool.insert(0, (client_id, client_secret))
+    return CredentialPool(pool) if pool else None
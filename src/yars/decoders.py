@@ -0,0 +1,186 @@
+"""Pluggable JSON decoders for Reddit responses.
+
+``json`` (stdlib) is always available; ``orjson`` decodes the same plain
+dicts several times faster. ``msgspec`` goes further: it decodes listing,
+thread and morechildren payloads against the TypedDict schemas below,
+building only the fields the parsers read and skipping the ~100 others
+Reddit sends per post or comment. The results are still plain dicts, so
+every parser works unchanged with any backend.
+
+``get_decoder("auto")`` picks the fastest installed backend. orjson and
+msgspec are only imported when a decoder using them is created.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from importlib.util import find_spec
+from typing import Optional, TypedDict, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ImageSource(TypedDict, total=False):
+    url: str
+
+
+class PreviewImage(TypedDict, total=False):
+    source: ImageSource
+
+
+class Preview(TypedDict, total=False):
+    images: list[PreviewImage]
+
+
+class ThingData(TypedDict, total=False):
+    """Fields of a post (t3), comment (t1) or "more" stub used by the parsers."""
+
+    id: str
+    name: str
+    parent_id: str
+    title: str
+    author: str
+    permalink: str
+    subreddit: str
+    score: int
+    num_comments: int
+    created_utc: float
+    selftext: str
+    body: str
+    url: str
+    post_hint: str
+    thumbnail: Optional[str]
+    preview: Preview
+    replies: Union["Listing", str]
+    children: list[str]
+
+
+class Thing(TypedDict, total=False):
+    kind: str
+    data: ThingData
+
+
+class ListingData(TypedDict, total=False):
+    after: Optional[str]
+    children: list[Thing]
+
+
+class Listing(TypedDict, total=False):
+    kind: str
+    data: ListingData
+
+
+class MoreChildrenData(TypedDict, total=False):
+    things: list[Thing]
+
+
+class MoreChildrenJSON(TypedDict, total=False):
+    data: MoreChildrenData
+
+
+class MoreChildren(TypedDict, total=False):
+    json: MoreChildrenJSON
+
+
+def schema_for(path):
+    """Schema of the payload Reddit returns for an API ``path``."""
+    if path is None:
+        return None
+    if path.endswith("/api/morechildren"):
+        return MoreChildren
+    if "/comments/" in path:
+        return list[Listing]
+    return Listing
+
+
+def schema_covers(fields):
+    """Whether the schemas keep every one of ``fields`` of a thing."""
+    return set(fields) <= ThingData.__optional_keys__ | {"kind"}
+
+
+class JSONDecoder:
+    """Standard library json; the fallback when nothing faster is installed."""
+
+    __slots__ = ()
+
+    name = "json"
+
+    def decode(self, body, path=None):
+        return json.loads(body)
+
+
+def _installed(module):
+    return find_spec(module) is not None
+
+
+class OrjsonDecoder:
+    __slots__ = ("_loads",)
+
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError(
+                "OrjsonDecoder requires orjson - `pip install orjson`"
+            ) from None
+        self._loads = orjson.loads
+
+    def decode(self, body, path=None):
+        return self._loads(body)
+
+
+class MsgspecDecoder:
+    """Schema-driven decoding; payloads that don't match fall back to untyped."""
+
+    __slots__ = ("_decoders", "_untyped", "_error")
+
+    name = "msgspec"
+
+    def __init__(self):
+        try:
+            import msgspec
+        except ImportError:
+            raise ImportError(
+                "MsgspecDecoder requires msgspec - `pip install msgspec`"
+            ) from None
+        self._error = msgspec.ValidationError
+        self._untyped = msgspec.json.Decoder()
+        self._decoders = {
+            schema: msgspec.json.Decoder(schema)
+            for schema in (Listing, list[Listing], MoreChildren)
+        }
+
+    def decode(self, body, path=None):
+        decoder = self._decoders.get(schema_for(path), self._untyped)
+        try:
+            return decoder.decode(body)
+        except self._error as e:
+            logger.debug("Payload for %s doesn't match its schema: %s", path, e)
+            return self._untyped.decode(body)
+
+
+DECODERS = {"json": JSONDecoder, "orjson": OrjsonDecoder, "msgspec": MsgspecDecoder}
+
+
+def get_decoder(decoder="auto"):
+    """Return a decoder instance for a backend name, or ``decoder`` itself.
+
+    ``"auto"`` prefers msgspec, then orjson, then the standard library.
+    """
+    if not isinstance(decoder, str):
+        return decoder
+    if decoder == "auto":
+        if _installed("msgspec"):
+            return MsgspecDecoder()
+        if _installed("orjson"):
+            return OrjsonDecoder()
+        return JSONDecoder()
+    try:
+        return DECODERS[decoder]()
+    except KeyError:
+        raise ValueError(
+            f"decoder must be 'auto' or one of {tuple(DECODERS)}, got {decoder!r}"
+        ) from None
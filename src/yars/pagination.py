@@ -0,0 +1,119 @@
+"""Lazy pagination over Reddit listings.
+
+A Listing fetches one page at a time as it is iterated, so callers can
+start working on the first page right away and memory stays flat however
+large ``limit`` is. ``after`` always holds the cursor of the next page to
+fetch, which can be passed back in later to continue where a run stopped.
+Given a Checkpoint (see yars.checkpoint), a listing also persists that
+cursor after every page and can pick it up again with ``resume=True``.
+"""
+
+from __future__ import annotations
+
+# Most items Reddit returns per listing page.
+PAGE_SIZE = 100
+
+
+class Listing:
+    """Iterable over up to ``limit`` items of a paginated listing.
+
+    ``fetch_page(after, page_limit)`` must return ``(items, next_after)``,
+    or None when the request failed. Iterating yields items; ``pages()``
+    yields one list per page. A failed request ends the listing early and
+    sets ``failed``, so callers can tell a partial crawl from a complete
+    one.
+
+    With a ``checkpoint``, the cursor is saved once the caller moves past
+    each page and cleared when the listing completes; a failed request
+    leaves the last checkpoint in place. ``resume=True`` starts from the
+    saved cursor, counting items fetched by earlier runs towards ``limit``.
+    """
+
+    __slots__ = (
+        "_fetch_page",
+        "limit",
+        "after",
+        "count",
+        "exhausted",
+        "failed",
+        "checkpoint",
+    )
+
+    def __init__(self, fetch_page, limit, after=None, checkpoint=None, resume=False):
+        self._fetch_page = fetch_page
+        self.limit = limit
+        self.after = after
+        self.count = 0
+        self.exhausted = False
+        self.failed = False
+        self.checkpoint = checkpoint
+        if checkpoint is not None and resume and after is None:
+            saved = checkpoint.load()
+            if saved is not None:
+                self.after, self.count = saved
+
+    def _next_page_limit(self):
+        if self.exhausted or self.count >= self.limit:
+            return 0
+        return min(PAGE_SIZE, self.limit - self.count)
+
+    def _advance(self, result):
+        """Apply a fetched page to the cursor and return its items."""
+        if result is None:
+            self.exhausted = True
+            self.failed = True
+            return []
+        items, after = result
+        items = items[: self.limit - self.count]
+        self.count += len(items)
+        self.after = after
+        if not items or not after:
+            self.exhausted = True
+            self.after = None
+        return items
+
+    def _save_checkpoint(self):
+        if self.checkpoint is None:
+            return
+        if self.after is None or self.count >= self.limit:
+            self.checkpoint.clear()
+        else:
+            self.checkpoint.save(self.after, self.count)
+
+    def pages(self):
+        while page_limit := self._next_page_limit():
+            result = self._fetch_page(self.after, page_limit)
+            items = self._advance(result)
+            if items:
+                yield items
+            # Only reached once the caller asks for the next page, i.e. has
+            # finished with this one.
+            if result is not None:
+                self._save_checkpoint()
+
+    def __iter__(self):
+        for page in self.pages():
+            yield from page
+
+
+class AsyncListing(Listing):
+    """Listing whose ``fetch_page`` is a coroutine; use ``async for``."""
+
+    __slots__ = ()
+
+    async def pages(self):
+        while page_limit := self._next_page_limit():
+            result = await self._fetch_page(self.after, page_limit)
+            items = self._advance(result)
+            if items:
+                yield items
+            if result is not None:
+                self._save_checkpoint()
+
+    def __iter__(self):
+        raise TypeError("AsyncListing must be iterated with 'async for'")
+
+    async def __aiter__(self):
+        async for page in self.pages():
+            for item in page:
+                yield item
@@ -0,0 +1,354 @@
+"""Turn raw Reddit JSON into the plain dicts returned by YARS.
+
+Shared by the synchronous and asynchronous clients so both return exactly
+the same shapes.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+SUBREDDIT_CATEGORIES = ("hot", "top", "new")
+USER_CATEGORIES = ("userhot", "usertop", "usernew")
+TIME_FILTERS = ("hour", "day", "week", "month", "year", "all")
+
+# Most ids Reddit accepts in one /api/info request.
+INFO_BATCH_SIZE = 100
+# Most comment ids Reddit accepts in one /api/morechildren request.
+MORECHILDREN_BATCH_SIZE = 100
+
+
+def parse_search_result(post_data):
+    return {
+        "title": post_data["title"],
+        "link": f"https://www.reddit.com{post_data['permalink']}",
+        "description": post_data.get("selftext", "")[:269],
+    }
+
+
+def parse_search_results(data, parse=None):
+    """Parse a search listing; ``parse`` is called with each child if given."""
+    children = data.get("data", {}).get("children", [])
+    if parse is None:
+        results = [parse_search_result(post["data"]) for post in children]
+    else:
+        results = [parse(post) for post in children]
+    logger.info("Search returned %d results", len(results))
+    return results
+
+
+def image_url(post_data):
+    """URL of a post's image, or None if it has none."""
+    if post_data.get("post_hint") == "image" and "url" in post_data:
+        return post_data["url"]
+    if "preview" in post_data and "images" in post_data["preview"]:
+        return post_data["preview"]["images"][0]["source"]["url"]
+    return None
+
+
+def thumbnail_url(post_data):
+    """URL of a post's thumbnail, or None if it has none."""
+    thumbnail = post_data.get("thumbnail") or ""
+    # Reddit uses placeholders like "self", "default", "nsfw", "spoiler"
+    return thumbnail if thumbnail.startswith("http") else None
+
+
+def parse_post(post_data):
+    post_info = {
+        "title": post_data["title"],
+        "author": post_data["author"],
+        "permalink": post_data["permalink"],
+        "score": post_data["score"],
+        "num_comments": post_data["num_comments"],
+        "created_utc": post_data["created_utc"],
+        "body": post_data.get("selftext", ""),
+    }
+    image = image_url(post_data)
+    if image is not None:
+        post_info["image_url"] = image
+    thumbnail = thumbnail_url(post_data)
+    if thumbnail is not None:
+        post_info["thumbnail_url"] = thumbnail
+    return post_info
+
+
+def parse_user_item(item):
+    """Parse one child of a user overview listing, or None for other kinds."""
+    kind = item["kind"]
+    item_data = item["data"]
+    item_url = f"https://www.reddit.com{item_data.get('permalink', '')}"
+    if kind == "t3":
+        return {
+            "type": "post",
+            "title": item_data.get("title", ""),
+            "subreddit": item_data.get("subreddit", ""),
+            "url": item_url,
+            "created_utc": item_data.get("created_utc", ""),
+        }
+    if kind == "t1":
+        return {
+            "type": "comment",
+            "subreddit": item_data.get("subreddit", ""),
+            "body": item_data.get("body", ""),
+            "created_utc": item_data.get("created_utc", ""),
+            "url": item_url,
+        }
+    return None
+
+
+def parse_listing_page(data, parse):
+    """Parse one listing page into ``(items, after)``, or None if malformed.
+
+    ``parse`` is called with each child and may return None to skip it.
+    """
+    listing = data.get("data") if isinstance(data, dict) else None
+    if not isinstance(listing, dict) or "children" not in listing:
+        return None
+    items = [item for item in map(parse, listing["children"]) if item is not None]
+    return items, listing.get("after")
+
+
+def parse_listing_post(child):
+    return parse_post(child["data"])
+
+
+def parse_post_details(post_data, path, index=None, more=None, comment=None, post=None):
+    """Parse a thread payload ([post listing, comment listing]).
+
+    ``index``, ``more`` and ``comment`` are passed through to
+    extract_comments. ``post`` builds the result from the post's ``data``
+    dict before ``comments`` is added (default: its title and body).
+    """
+    if not isinstance(post_data, list) or len(post_data) < 2:
+        logger.warning("Unexpected post data structure for %s", path)
+        return None
+
+    main_post = post_data[0]["data"]["children"][0]["data"]
+    details = (post or _post_summary)(main_post)
+    details["comments"] = extract_comments(
+        post_data[1]["data"]["children"], index, more, comment
+    )
+    logger.info("Successfully scraped post: %s", main_post.get("title"))
+    return details
+
+
+def _post_summary(post_data):
+    return {"title": post_data["title"], "body": post_data.get("selftext", "")}
+
+
+def _comment_dict(comment_data):
+    return {
+        "author": comment_data.get("author", ""),
+        "body": comment_data.get("body", ""),
+        "score": comment_data.get("score", 0),
+        "replies": [],
+    }
+
+
+def _replies_of(extracted_comment):
+    """The mutable reply list of a comment dict or records.Comment."""
+    if isinstance(extracted_comment, dict):
+        return extracted_comment["replies"]
+    return extracted_comment.reply_list()
+
+
+def _comment_fullname(comment_data):
+    return comment_data.get("name") or f"t1_{comment_data.get('id', '')}"
+
+
+def extract_comments(comments, index=None, more=None, comment=None):
+    """Build the nested comment list from a listing's children.
+
+    Walks the tree with an explicit stack, so thread depth is not bounded
+    by the recursion limit. If given, ``index`` maps each comment's
+    fullname to its extracted dict and ``more`` collects the comment ids
+    hidden behind "load more" stubs, so the thread can be completed later
+    with splice_more_children. ``comment`` builds each comment from its
+    ``data`` dict (default: a plain dict).
+    """
+    make_comment = comment or _comment_dict
+    extracted_comments = []
+    stack = [(iter(comments), extracted_comments)]
+    while stack:
+        children, target = stack[-1]
+        for child in children:
+            if not isinstance(child, dict):
+                continue
+            kind = child.get("kind")
+            if kind == "t1":
+                comment_data = child.get("data", {})
+                extracted_comment = make_comment(comment_data)
+                if index is not None:
+                    index[_comment_fullname(comment_data)] = extracted_comment
+                target.append(extracted_comment)
+
+                replies = comment_data.get("replies", "")
+                if isinstance(replies, dict):
+                    # Descend now; this level resumes from its iterator later.
+                    stack.append(
+                        (
+                            iter(replies.get("data", {}).get("children", [])),
+                            _replies_of(extracted_comment),
+                        )
+                    )
+                    break
+            elif kind == "more" and more is not None:
+                # "Continue this thread" stubs have no ids and can't be
+                # expanded through /api/morechildren.
+                more.extend(child.get("data", {}).get("children", []))
+        else:
+            stack.pop()
+    return extracted_comments
+
+
+def iter_comments(comments, parent_id=None):
+    """Yield a comment tree as flat records, parents before their replies.
+
+    Each record has ``id``, ``parent_id``, ``depth`` (0 for top-level),
+    ``author``, ``body`` and ``score``. Nothing is accumulated, so a thread
+    can be streamed to disk without building the nested structure.
+    """
+    stack = [(iter(comments), parent_id, 0)]
+    while stack:
+        children, parent, depth = stack[-1]
+        for comment in children:
+            if not isinstance(comment, dict) or comment.get("kind") != "t1":
+                continue
+            comment_data = comment.get("data", {})
+            fullname = _comment_fullname(comment_data)
+            yield {
+                "id": comment_data.get("id", ""),
+                "parent_id": comment_data.get("parent_id", parent),
+                "depth": depth,
+                "author": comment_data.get("author", ""),
+                "body": comment_data.get("body", ""),
+                "score": comment_data.get("score", 0),
+            }
+
+            replies = comment_data.get("replies", "")
+            if isinstance(replies, dict):
+                stack.append(
+                    (
+                        iter(replies.get("data", {}).get("children", [])),
+                        fullname,
+                        depth + 1,
+                    )
+                )
+                break
+        else:
+            stack.pop()
+
+
+def splice_more_children(things, comments, index, more, comment=None):
+    """Attach flat /api/morechildren results to an extracted comment tree.
+
+    ``things`` is the ``json.data.things`` list of one or more responses.
+    Comments are hung under their parent via ``index`` (top-level ones are
+    appended to ``comments``); ids of any further "more" stubs are appended
+    to ``more``. Returns the number of comments attached.
+    """
+    make_comment = comment or _comment_dict
+    new = []
+    for thing in things:
+        kind = thing.get("kind")
+        thing_data = thing.get("data", {})
+        if kind == "t1":
+            extracted_comment = make_comment(thing_data)
+            # Register the whole batch before attaching anything: a reply
+            # can arrive ahead of its parent when ids span several batches.
+            index[_comment_fullname(thing_data)] = extracted_comment
+            new.append((thing_data.get("parent_id", ""), extracted_comment))
+        elif kind == "more":
+            more.extend(thing_data.get("children", []))
+
+    attached = 0
+    for parent_id, extracted_comment in new:
+        if parent_id.startswith("t3_"):
+            comments.append(extracted_comment)
+        elif parent_id in index:
+            _replies_of(index[parent_id]).append(extracted_comment)
+        else:
+            logger.debug("Dropping comment with unknown parent %s", parent_id)
+            continue
+        attached += 1
+    return attached
+
+
+ResultParsers = namedtuple("ResultParsers", "post listing_post user_item comment")
+ResultParsers.__doc__ = """The functions that turn raw Reddit items into results."""
+
+DICT_PARSERS = ResultParsers(
+    post=parse_post,
+    listing_post=parse_listing_post,
+    user_item=parse_user_item,
+    comment=_comment_dict,
+)
+
+
+def _raw(item):
+    return item
+
+
+# Listing children are returned exactly as Reddit sent them. Threads are
+# returned as the whole payload, so there is no raw comment parser.
+RAW_PARSERS = ResultParsers(post=_raw, listing_post=_raw, user_item=_raw, comment=None)
+
+
+def projected_parsers(fields):
+    """ResultParsers that keep only ``fields`` of each item.
+
+    Fields are keys of Reddit's ``data`` objects ("id", "score",
+    "created_utc", "selftext", ...), plus "kind" for a listing child's
+    type; missing fields are None. Comments also get their ``replies``.
+    """
+    fields = tuple(fields)
+
+    def project(data):
+        return {field: data.get(field) for field in fields}
+
+    def project_child(child):
+        data = child["data"]
+        return {
+            field: child["kind"] if field == "kind" else data.get(field)
+            for field in fields
+        }
+
+    def project_comment(data):
+        comment = project(data)
+        comment["replies"] = []
+        return comment
+
+    return ResultParsers(
+        post=project,
+        listing_post=project_child,
+        user_item=project_child,
+        comment=project_comment,
+    )
+
+
+def chunk_ids(ids, size=MORECHILDREN_BATCH_SIZE):
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+def chunk_fullnames(ids, size=INFO_BATCH_SIZE):
+    """Normalise post ids to t3_ fullnames and split them into batches."""
+    fullnames = [i if i.startswith("t3_") else f"t3_{i}" for i in ids]
+    return chunk_ids(fullnames, size)
+
+
+def listing_path(subreddit, category, time_filter):
+    """Validate a listing request and return (path, extra params)."""
+    if category not in SUBREDDIT_CATEGORIES + USER_CATEGORIES:
+        raise ValueError(
+            f"Category must be one of {SUBREDDIT_CATEGORIES} for a subreddit "
+            f"or {USER_CATEGORIES} for a user"
+        )
+    if time_filter not in TIME_FILTERS:
+        raise ValueError(f"time_filter must be one of {TIME_FILTERS}")
+
+    if category in USER_CATEGORIES:
+        return f"/user/{subreddit}/submitted", {"sort": category[4:]}
+    return f"/r/{subreddit}/{category}", {}
@@ -0,0 +1,177 @@
+"""Proxy rotation with per-proxy health tracking.
+
+A ProxyPool hands out proxies round-robin (or keeps one per sticky
+session) and records how each request through them went. A proxy that
+fails to connect or gets throttled/blocked (429/403) is benched for a
+cooldown that doubles with every consecutive strike, so a dead proxy is
+skipped after one failure instead of stalling every request in retries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import namedtuple
+
+# Statuses that mean Reddit is throttling or blocking the proxy's IP.
+BLOCK_STATUSES = (403, 429)
+
+# Most proxies one request fails over to before giving up.
+MAX_PROXY_ATTEMPTS = 3
+
+# Weight of the newest sample in the latency moving average.
+LATENCY_ALPHA = 0.2
+
+ProxyStats = namedtuple(
+    "ProxyStats",
+    "url requests errors throttled forbidden latency error_rate benched_for",
+)
+ProxyStats.__doc__ = (
+    """Health of one proxy; ``benched_for`` is seconds left on the bench."""
+)
+
+
+class Proxy:
+    """One proxy URL and its request history."""
+
+    __slots__ = (
+        "url",
+        "requests",
+        "errors",
+        "throttled",
+        "forbidden",
+        "latency",
+        "strikes",
+        "benched_until",
+    )
+
+    def __init__(self, url):
+        self.url = url
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.forbidden = 0
+        self.latency = None
+        self.strikes = 0
+        self.benched_until = 0.0
+
+    def __repr__(self):
+        return f"Proxy({self.url!r})"
+
+    @property
+    def proxies(self):
+        """Mapping for the ``proxies`` argument of requests."""
+        return {"http": self.url, "https": self.url}
+
+
+class ProxyPool:
+    """Proxies that requests rotate over, skipping unhealthy ones.
+
+    With ``sticky=True`` every request reuses the current proxy until it is
+    benched; otherwise each request takes the next available one. Benched
+    proxies come back after ``cooldown * 2 ** (strikes - 1)`` seconds,
+    capped at ``max_cooldown``. If every proxy is benched, the one that
+    comes back first is used anyway rather than failing outright.
+    """
+
+    __slots__ = (
+        "proxies",
+        "sticky",
+        "cooldown",
+        "max_cooldown",
+        "clock",
+        "_next",
+        "_current",
+        "_lock",
+    )
+
+    def __init__(
+        self, proxies, sticky=False, cooldown=30, max_cooldown=900, clock=time.monotonic
+    ):
+        self.proxies = [p if isinstance(p, Proxy) else Proxy(p) for p in proxies]
+        if not self.proxies:
+            raise ValueError("ProxyPool needs at least one proxy")
+        self.sticky = sticky
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self._next = 0
+        self._current = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.proxies)
+
+    def __iter__(self):
+        return iter(self.proxies)
+
+    def choose(self):
+        with self._lock:
+            now = self.clock()
+            current = self._current
+            if self.sticky and current is not None and current.benched_until <= now:
+                return current
+            n = len(self.proxies)
+            for i in range(n):
+                proxy = self.proxies[(self._next + i) % n]
+                if proxy.benched_until <= now:
+                    self._next = (self._next + i + 1) % n
+                    break
+            else:
+                proxy = min(self.proxies, key=lambda p: p.benched_until)
+            self._current = proxy
+            return proxy
+
+    def record(self, proxy, status=None, latency=None):
+        """Record a response through ``proxy`` (``status=None``: no response)."""
+        with self._lock:
+            proxy.requests += 1
+            if latency is not None:
+                proxy.latency = (
+                    latency
+                    if proxy.latency is None
+                    else LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * proxy.latency
+                )
+            if status is None:
+                proxy.errors += 1
+            elif status == 429:
+                proxy.throttled += 1
+            elif status == 403:
+                proxy.forbidden += 1
+            if status is None or status in BLOCK_STATUSES:
+                proxy.strikes += 1
+                delay = min(self.cooldown * 2 ** (proxy.strikes - 1), self.max_cooldown)
+                proxy.benched_until = self.clock() + delay
+            else:
+                proxy.strikes = 0
+
+    def stats(self):
+        """ProxyStats for every proxy, in pool order."""
+        with self._lock:
+            now = self.clock()
+            return [
+                ProxyStats(
+                    p.url,
+                    p.requests,
+                    p.errors,
+                    p.throttled,
+                    p.forbidden,
+                    p.latency,
+                    (
+                        (p.errors + p.throttled + p.forbidden) / p.requests
+                        if p.requests
+                        else 0.0
+                    ),
+                    max(0.0, p.benched_until - now),
+                )
+                for p in self.proxies
+            ]
+
+
+def proxy_pool(proxy):
+    """Build a ProxyPool from a list of proxy URLs, or None for a single proxy."""
+    if proxy is None or isinstance(proxy, str):
+        return None
+    if isinstance(proxy, ProxyPool):
+        return proxy
+    return ProxyPool(proxy)
@@ -0,0 +1,129 @@
+"""Retry policies for failed or throttled requests.
+
+A RetryPolicy decides whether and how long to wait before trying a request
+again. Waits use decorrelated jitter (each wait is drawn between ``base``
+and three times the previous one, capped at ``cap``) so that many workers
+retrying at once spread out instead of hitting Reddit in lockstep. A
+``Retry-After`` header, when present, is used as the wait instead. No
+retry starts once the wall-clock time of a call - attempts and waits
+together - would pass ``max_total_delay``, which keeps tail latency
+predictable under load (the last attempt can still take up to the request
+timeout).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def retry_after(headers):
+    """Seconds to wait from a Retry-After header, or None if absent/invalid."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """How many times, on what, and how long to wait before retrying.
+
+    ``retries`` is the number of retries after the first attempt; responses
+    with a status in ``statuses`` and, with ``retry_errors``, connection
+    errors are retried. A wait that would push the time since the call
+    started over ``max_total_delay`` seconds gives up instead; ``clock``
+    measures that time.
+    """
+
+    __slots__ = (
+        "retries",
+        "base",
+        "cap",
+        "max_total_delay",
+        "statuses",
+        "retry_errors",
+        "respect_retry_after",
+        "jitter",
+        "clock",
+    )
+
+    def __init__(
+        self,
+        retries=5,
+        base=1.0,
+        cap=10.0,
+        max_total_delay=20.0,
+        statuses=RETRY_STATUSES,
+        retry_errors=True,
+        respect_retry_after=True,
+        jitter=random.uniform,
+        clock=time.monotonic,
+    ):
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+        self.max_total_delay = max_total_delay
+        self.statuses = frozenset(statuses)
+        self.retry_errors = retry_errors
+        self.respect_retry_after = respect_retry_after
+        self.jitter = jitter
+        self.clock = clock
+
+    def should_retry(self, status):
+        return status in self.statuses
+
+    def start(self):
+        """Retry state for one call."""
+        return RetryState(self)
+
+
+class RetryState:
+    """Attempts made and time spent so far for one call."""
+
+    __slots__ = ("policy", "retries", "previous", "waited", "started")
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.retries = 0
+        self.previous = policy.base
+        self.waited = 0.0
+        self.started = policy.clock()
+
+    def elapsed(self):
+        """Seconds since the call started, attempts included."""
+        return self.policy.clock() - self.started
+
+    def next_delay(self, retry_after=None):
+        """Seconds to wait before retrying, or None to give up."""
+        policy = self.policy
+        if self.retries >= policy.retries:
+            return None
+        if retry_after is not None and policy.respect_retry_after:
+            delay = retry_after
+        else:
+            delay = min(policy.cap, policy.jitter(policy.base, self.previous * 3))
+            self.previous = delay
+        if (
+            policy.max_total_delay is not None
+            and self.elapsed() + delay > policy.max_total_delay
+        ):
+            return None
+        self.retries += 1
+        self.waited += delay
+        return delay
+
+
+# Data requests can afford a few patient retries; a token request that
+# keeps failing usually means bad credentials, so give up quickly.
+DEFAULT_RETRY = RetryPolicy()
+DEFAULT_TOKEN_RETRY = RetryPolicy(retries=2, cap=5.0, max_total_delay=10.0)
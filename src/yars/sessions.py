@@ -1,15 +1,30 @@
 from requests import Session
 
-from .agents import get_agent
+from .agents import default_rotator
 
 
 class RandomUserAgentSession(Session):
     """
     Session class (inherited from requests.Session) which passes
     a random user agent with each request
+
+    Agents come from ``user_agents`` (a UserAgentRotator, by default the
+    shared weighted one), stick to the proxy a request goes through, and
+    are weighted down when they draw a 403/429.
     """
 
-    def request(self, *args, **kwargs):
-        self.headers.update({"User-Agent": get_agent()})
+    def __init__(self, user_agents=None):
+        super().__init__()
+        self.user_agents = user_agents
+
+    def request(self, method, url, *args, **kwargs):
+        rotator = self.user_agents or default_rotator()
+        proxies = kwargs.get("proxies") or self.proxies
+        agent = rotator.choose(proxies.get("https") if proxies else None)
+        # Set per request rather than on self.headers, so threads sharing
+        # the session don't overwrite each other's user agent.
+        kwargs["headers"] = {"User-Agent": agent, **(kwargs.get("headers") or {})}
 
-        return super().request(*args, **kwargs)
+        response = super().request(method, url, *args, **kwargs)
+        rotator.record(agent, response.status_code)
+        return response
@@ -0,0 +1,110 @@
+"""HTTP/2-capable transport for the synchronous client.
+
+HTTPXAdapter lets a requests.Session send through httpx, which multiplexes
+requests over one HTTP/2 connection per host instead of holding one
+HTTP/1.1 connection per in-flight request. Requires ``httpx`` with the
+``h2`` extra (``pip install yars[http2]``).
+"""
+
+from __future__ import annotations
+
+import ssl
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+def _httpx_timeout(timeout):
+    # requests takes a number or a (connect, read) tuple.
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class HTTPXAdapter(BaseAdapter):
+    """requests transport adapter backed by pooled httpx clients.
+
+    One httpx.Client is kept per proxy, since httpx binds proxies per
+    client. Clients are thread-safe, so one adapter can serve every thread
+    sharing the session. Responses are read fully (no streaming) and do not
+    go through urllib3's Retry.
+    """
+
+    def __init__(self, http2=True, max_connections=10, keep_alive=True):
+        if httpx is None:
+            raise ImportError(
+                "HTTPXAdapter requires httpx - install it with "
+                "`pip install httpx[http2]`"
+            )
+        super().__init__()
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections if keep_alive else 0,
+        )
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, proxy, verify, cert):
+        key = (proxy, verify, cert)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if isinstance(verify, str):
+                    # requests passes CA bundle paths; httpx wants a context.
+                    verify = ssl.create_default_context(cafile=verify)
+                client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    proxy=proxy,
+                    verify=verify,
+                    cert=cert,
+                )
+                self._clients[key] = client
+            return client
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        client = self._client(select_proxy(request.url, proxies), verify, cert)
+        try:
+            response = client.request(
+                request.method,
+                request.url,
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=_httpx_timeout(timeout),
+            )
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request) from e
+        return self.build_response(request, response)
+
+    def build_response(self, request, resp):
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.reason = resp.reason_phrase
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        # httpx has already decoded any Content-Encoding.
+        response._content = resp.content
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            client.close()
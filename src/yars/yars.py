@@ -1,27 +1,38 @@
 from __future__ import annotations
 
 import logging
-import os
-import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+from .batch import fan_out, flatten_pages, interleave
+from .cache import conditional_headers, is_fresh
+from .client import DEFAULT_OAUTH_USER_AGENT, TOKEN_URL, BaseClient
+from .columns import CommentTree, PostBatch, listing_post_data
+from .pagination import Listing
+from .parsers import (  # noqa: F401 - constants re-exported for callers
+    SUBREDDIT_CATEGORIES,
+    TIME_FILTERS,
+    USER_CATEGORIES,
+    chunk_fullnames,
+    chunk_ids,
+    extract_comments,
+    iter_comments,
+    parse_listing_page,
+    splice_more_children,
+)
+from .proxies import BLOCK_STATUSES, MAX_PROXY_ATTEMPTS
+from .retry import retry_after
 from .sessions import RandomUserAgentSession
 
 logger = logging.getLogger(__name__)
 
-SUBREDDIT_CATEGORIES = ("hot", "top", "new")
-USER_CATEGORIES = ("userhot", "usertop", "usernew")
-TIME_FILTERS = ("hour", "day", "week", "month", "year", "all")
 
-TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
-DEFAULT_OAUTH_USER_AGENT = "yars/0.1 (Reddit data scraper)"
-
-
-class YARS:
+class YARS(BaseClient):
     """Reddit scraper.
 
     Works in two modes:
@@ -31,17 +42,63 @@ class YARS:
       REDDIT_CLIENT_SECRET env vars) from a free "script" app created at
       https://www.reddit.com/prefs/apps. Requests then go to
       oauth.reddit.com, which works from blocked IPs and has a higher
-      rate limit.
+      rate limit. Pass several ``(client_id, client_secret)`` pairs (or a
+      CredentialPool) as ``credentials`` to spread requests over multiple
+      apps, each with its own token and rate budget.
+
+    Every request is paced by ``rate_limiter`` (a RateLimiter with separate
+    anonymous and OAuth budgets by default); pass ``rate_limiter=False`` to
+    disable pacing.
+
+    ``checkpoints`` (a CheckpointStore or a SQLite file path) makes listing
+    crawls record their cursor after every page, so they can be continued
+    with ``resume=True`` after a crash. ``cache`` (a ResponseCache or a
+    SQLite file path) keeps responses on disk with per-endpoint TTLs, and
+    ``memory_cache`` (an LRUCache or a maximum entry count) keeps parsed
+    scrape_post_details / scrape_user_data results in memory.
+
+    ``proxy`` is a single proxy URL used for every request, or a list of
+    URLs (or a ProxyPool) to rotate over. With a pool, a request whose
+    proxy cannot connect or is throttled/blocked (429/403) is retried once
+    or twice through another proxy, and the failing one is benched for a
+    while; ``proxy_stats`` reports per-proxy health. In anonymous mode each
+    request carries a user agent from ``user_agents`` (a UserAgentRotator,
+    by default the shared one weighted towards recent browsers), kept per
+    proxy and weighted down when it draws a 403/429.
+
+    ``pool_connections`` (hosts kept pooled) and ``pool_maxsize``
+    (connections kept per host) size the connection pool; set
+    ``pool_maxsize`` to at least the number of threads sharing the client,
+    otherwise extra connections are opened and thrown away after each
+    request, or, with ``pool_block=True``, threads wait for a free one.
+    ``keep_alive=False`` closes connections after every request, and
+    ``http2=True`` sends through an httpx-based HTTP/2 transport instead
+    (needs ``httpx[http2]``).
+
+    Failed and throttled requests are retried according to ``retry``, and
+    token requests according to ``token_retry`` (RetryPolicy objects, see
+    yars.retry): jittered backoff that honours Retry-After and gives up
+    once a call has used up its time budget. ``breaker`` (a
+    CircuitBreaker, on by default; ``False`` disables it) makes calls to an
+    endpoint family that keeps failing - e.g. because Reddit blocked the
+    IP - raise yars.breaker.CircuitOpenError straight away for a cooldown
+    (fan-out and multi-subreddit crawls report it per item);
+    ``breaker_states`` shows which circuits are open.
+
+    Responses are parsed by ``decoder``: "json", "orjson", "msgspec" (see
+    yars.decoders) or "auto" for the fastest one installed. With
+    ``records=True`` posts, comments and user items come back as the
+    compact Post/Comment/UserItem records from yars.records instead of
+    dicts.
+
+    A YARS instance may be shared between threads: the connection pool,
+    rate limiter, caches, checkpoint store and credential/proxy pools are
+    all thread-safe, and per-request headers are passed per call rather
+    than written to the shared session. Don't mutate ``session`` while
+    other threads are using the client.
     """
 
-    __slots__ = (
-        "session",
-        "proxy",
-        "timeout",
-        "_auth",
-        "_token",
-        "_token_expiry",
-    )
+    __slots__ = ("session",)
 
     def __init__(
         self,
@@ -51,111 +108,302 @@ class YARS:
         client_id=None,
         client_secret=None,
         user_agent=None,
+        rate_limiter=None,
+        checkpoints=None,
+        cache=None,
+        memory_cache=None,
+        credentials=None,
+        user_agents=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        http2=False,
+        retry=None,
+        token_retry=None,
+        breaker=None,
+        decoder="auto",
+        records=False,
     ):
-        client_id = client_id or os.environ.get("REDDIT_CLIENT_ID")
-        client_secret = client_secret or os.environ.get("REDDIT_CLIENT_SECRET")
-        self._auth = (client_id, client_secret) if client_id and client_secret else None
-        self._token = None
-        self._token_expiry = 0.0
+        super().__init__(
+            proxy=proxy,
+            timeout=timeout,
+            client_id=client_id,
+            client_secret=client_secret,
+            rate_limiter=rate_limiter,
+            checkpoints=checkpoints,
+            cache=cache,
+            memory_cache=memory_cache,
+            credentials=credentials,
+            retry=retry,
+            token_retry=token_retry,
+            breaker=breaker,
+            decoder=decoder,
+            records=records,
+        )
 
-        if self._auth:
+        if self.credentials:
             # Reddit's API rules require a stable, descriptive user agent
             # for authenticated clients - never a rotating browser one.
             self.session = requests.Session()
             self.session.headers["User-Agent"] = user_agent or DEFAULT_OAUTH_USER_AGENT
         elif random_user_agent:
-            self.session = RandomUserAgentSession()
+            self.session = RandomUserAgentSession(user_agents)
         else:
             self.session = requests.Session()
 
-        self.proxy = proxy
-        self.timeout = timeout
+        # Retries happen in _with_retries, not in the adapter, so that they
+        # follow self.retry and can switch proxies between attempts.
+        if http2:
+            from .transports import HTTPXAdapter  # optional httpx dependency
 
-        retries = Retry(
-            total=5,
-            backoff_factor=2,  # Exponential backoff
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+            adapter = HTTPXAdapter(max_connections=pool_maxsize, keep_alive=keep_alive)
+        else:
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
 
-        if proxy:
+        if proxy and not self.proxy_pool:
             self.session.proxies.update({"http": proxy, "https": proxy})
 
-    def _ensure_token(self):
-        """Fetch or refresh the OAuth app-only token."""
-        if self._token and time.time() < self._token_expiry - 60:
+    def _ensure_token(self, credential):
+        """Make sure ``credential`` has a valid OAuth app-only token.
+
+        Only one thread fetches a token at a time; the others wait for it
+        under ``credential.lock``. Shortly before expiry the token is
+        refreshed on a background thread while requests keep using the
+        current one.
+        """
+        if credential.token_valid():
+            if credential.token_expiring() and credential.lock.acquire(blocking=False):
+                threading.Thread(
+                    target=self._refresh_token, args=(credential,), daemon=True
+                ).start()
             return
+        with credential.lock:
+            if not credential.token_valid():
+                self._fetch_token(credential)
+
+    def _refresh_token(self, credential):
+        """Background refresh; runs with ``credential.lock`` already held."""
         try:
-            response = self.session.post(
+            if credential.token_expiring():
+                self._fetch_token(credential)
+        except RuntimeError as e:
+            logger.warning("Background token refresh failed: %s", e)
+        finally:
+            credential.lock.release()
+
+    def _fetch_token(self, credential):
+        def post():
+            return self.session.post(
                 TOKEN_URL,
-                auth=self._auth,
+                auth=credential.auth,
                 data={"grant_type": "client_credentials"},
                 timeout=self.timeout,
+                proxies=self.proxy_pool.choose().proxies if self.proxy_pool else None,
             )
+
+        try:
+            response = self._with_retries(self.token_retry, post, TOKEN_URL)
             response.raise_for_status()
             token_data = response.json()
-            self._token = token_data["access_token"]
+            token = token_data["access_token"]
         except (requests.RequestException, KeyError, ValueError) as e:
             raise RuntimeError(
                 "Reddit OAuth token request failed - check REDDIT_CLIENT_ID / "
                 f"REDDIT_CLIENT_SECRET: {e}"
             ) from e
-        self._token_expiry = time.time() + token_data.get("expires_in", 3600)
-        self.session.headers["Authorization"] = f"bearer {self._token}"
-        logger.info("Obtained Reddit OAuth token")
-
-    def _url(self, path):
-        """Build the full URL for a Reddit API path like '/r/python/hot'."""
-        if self._auth:
-            return f"https://oauth.reddit.com{path}"
-        return f"https://www.reddit.com{path}.json"
-
-    def _get_json(self, path, params=None):
-        """Fetch a Reddit API path and return parsed JSON, or None on failure."""
-        if self._auth:
-            self._ensure_token()
+        credential.set_token(token, token_data.get("expires_in", 3600))
+        logger.info("Obtained Reddit OAuth token for %s", credential.client_id)
+
+    def _throttle(self, credential=None):
+        """Block until the rate limiter allows another request.
+
+        Each credential is paced against its own bucket.
+        """
+        if not self.rate_limiter:
+            return
+        key = credential.client_id if credential else None
+        delay = self.rate_limiter.reserve(self._mode, key)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _with_retries(self, policy, send, url):
+        """Call ``send()`` until it gets a final response or ``policy`` gives up."""
+        state = policy.start()
+        while True:
+            try:
+                response = send()
+            except requests.RequestException as e:
+                delay = state.next_delay() if policy.retry_errors else None
+                if delay is None:
+                    raise
+                logger.info(
+                    "Request to %s failed (%s), retrying in %.1fs", url, e, delay
+                )
+            else:
+                if not policy.should_retry(response.status_code):
+                    return response
+                delay = state.next_delay(retry_after(response.headers))
+                if delay is None:
+                    return response
+                logger.info(
+                    "HTTP %s from %s, retrying in %.1fs",
+                    response.status_code,
+                    url,
+                    delay,
+                )
+            time.sleep(delay)
+
+    def _send(self, url, params, headers, credential):
+        """GET ``url`` with retries, as configured by ``self.retry``."""
+        return self._with_retries(
+            self.retry,
+            partial(self._send_once, url, params, headers, credential),
+            url,
+        )
+
+    def _send_once(self, url, params, headers, credential):
+        """GET ``url``, failing over to another proxy if the pool has one."""
+        if self.proxy_pool is None:
+            self._throttle(credential)
+            response = self.session.get(
+                url, params=params, headers=headers or None, timeout=self.timeout
+            )
+            self._record_budget(response, credential)
+            return response
+
+        attempts = min(len(self.proxy_pool), MAX_PROXY_ATTEMPTS)
+        for attempt in range(attempts):
+            proxy = self.proxy_pool.choose()
+            self._throttle(credential)
+            start = time.monotonic()
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers=headers or None,
+                    timeout=self.timeout,
+                    proxies=proxy.proxies,
+                )
+            except requests.RequestException as e:
+                self.proxy_pool.record(proxy)
+                if attempt == attempts - 1:
+                    raise
+                logger.info("Proxy %s failed (%s), trying another", proxy.url, e)
+                continue
+            self.proxy_pool.record(
+                proxy, response.status_code, time.monotonic() - start
+            )
+            self._record_budget(response, credential)
+            if response.status_code not in BLOCK_STATUSES:
+                break
+            logger.info("Proxy %s got HTTP %s", proxy.url, response.status_code)
+        return response
+
+    def _memoized(self, key, fetch, *args):
+        """Return a result through the in-memory LRU, if configured.
+
+        ``fetch(*args)`` returns ``(result, complete)``; only complete
+        results are cached, so a failed or partial fetch is retried.
+        """
+        if self.memory_cache is None:
+            return fetch(*args)[0]
+        result = self.memory_cache.get(key)
+        if result is None:
+            result, complete = fetch(*args)
+            if complete:
+                self.memory_cache.put(key, result)
+        return result
+
+    def _get_json(self, path, params=None, typed=True):
+        """Fetch a Reddit API path and return parsed JSON, or None on failure.
+
+        With a response cache, fresh entries are served without touching
+        the network and stale ones are revalidated when possible.
+        ``typed=False`` skips the decoder's schema and keeps every field.
+        Raises CircuitOpenError while the endpoint's circuit is open.
+        """
+        schema_path = path if typed else None
+        key, entry = self._cache_lookup(path, params)
+        if is_fresh(entry):
+            return self.decoder.decode(entry.body, schema_path)
+        headers = conditional_headers(entry) or {}
+        credential = None
+        if self.credentials:
+            credential = self.credentials.choose()
+            self._ensure_token(credential)
+            headers.update(credential.headers)
         url = self._url(path)
+        circuit = self._allow(url, path)
+        try:
+            response = self._send(url, params, headers, credential)
+        except requests.RequestException as e:
+            self._record_outcome(circuit, None)
+            logger.warning("Request to %s failed: %s", url, e)
+            return None
+        except BaseException:
+            # Cancelled or interrupted: no verdict, but free a probe slot.
+            self._release(circuit)
+            raise
+        self._record_outcome(circuit, response.status_code)
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
         except requests.RequestException as e:
             logger.warning("Request to %s failed: %s", url, e)
             return None
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, self.cache.ttl_for(path, params))
+            return self.decoder.decode(entry.body, schema_path)
         try:
-            return response.json()
+            data = self.decoder.decode(response.content, schema_path)
         except ValueError as e:
             logger.warning("Invalid JSON from %s: %s", url, e)
             return None
+        self._cache_store(key, path, params, response)
+        return data
 
-    def handle_search(self, path, params, after=None, before=None):
+    def handle_search(
+        self, path, params, after=None, before=None, fields=None, raw=False
+    ):
         if after:
             params["after"] = after
         if before:
             params["before"] = before
 
-        data = self._get_json(path, params)
-        if data is None:
-            return []
-
-        results = []
-        for post in data.get("data", {}).get("children", []):
-            post_data = post["data"]
-            results.append(
-                {
-                    "title": post_data["title"],
-                    "link": f"https://www.reddit.com{post_data['permalink']}",
-                    "description": post_data.get("selftext", "")[:269],
-                }
-            )
-        logger.info("Search returned %d results", len(results))
-        return results
+        parsers, typed = self._parsers_for(fields, raw)
+        data = self._get_json(path, params, typed)
+        return self._search_results(data, parsers, fields, raw)
 
-    def search_reddit(self, query, limit=10, after=None, before=None, sort="relevance"):
+    def search_reddit(
+        self,
+        query,
+        limit=10,
+        after=None,
+        before=None,
+        sort="relevance",
+        fields=None,
+        raw=False,
+    ):
         params = {"q": query, "limit": limit, "sort": sort, "type": "link"}
-        return self.handle_search("/search", params, after, before)
+        return self.handle_search("/search", params, after, before, fields, raw)
 
     def search_subreddit(
-        self, subreddit, query, limit=10, after=None, before=None, sort="relevance"
+        self,
+        subreddit,
+        query,
+        limit=10,
+        after=None,
+        before=None,
+        sort="relevance",
+        fields=None,
+        raw=False,
     ):
         params = {
             "q": query,
@@ -164,104 +412,201 @@ class YARS:
             "type": "link",
             "restrict_sr": "on",
         }
-        return self.handle_search(f"/r/{subreddit}/search", params, after, before)
+        return self.handle_search(
+            f"/r/{subreddit}/search", params, after, before, fields, raw
+        )
 
-    def scrape_post_details(self, permalink):
+    def scrape_post_details(
+        self, permalink, expand_more=False, max_workers=1, fields=None, raw=False
+    ):
+        """Scrape a post's title, body and nested comments.
+
+        With ``expand_more=True`` every "load more comments" stub in the
+        thread is resolved through /api/morechildren, 100 ids per call with
+        up to ``max_workers`` calls in flight, and spliced into the
+        ``replies`` tree. Reddit asks clients to keep a single morechildren
+        request in flight, hence the default of 1.
+
+        ``fields`` limits the post and each comment to those keys of their
+        ``data`` (comments keep ``replies``); ``raw=True`` returns Reddit's
+        thread payload as decoded, and cannot be combined with
+        ``expand_more``.
+        """
         path = permalink.rstrip("/")
-        post_data = self._get_json(path)
-        if post_data is None:
-            return None
+        if raw and expand_more:
+            raise ValueError("expand_more needs parsed comments, not raw=True")
+        fields = None if fields is None else tuple(fields)
+        return self._memoized(
+            ("post", path, expand_more, fields, raw),
+            self._scrape_post_details,
+            path,
+            expand_more,
+            max_workers,
+            fields,
+            raw,
+        )
 
-        if not isinstance(post_data, list) or len(post_data) < 2:
-            logger.warning("Unexpected post data structure for %s", path)
-            return None
+    def _scrape_post_details(self, path, expand_more, max_workers, fields, raw):
+        parsers, typed = self._parsers_for(fields, raw)
+        post_data = self._get_json(path, typed=typed)
+        if post_data is None or raw:
+            return post_data, post_data is not None
 
-        main_post = post_data[0]["data"]["children"][0]["data"]
-        title = main_post["title"]
-        body = main_post.get("selftext", "")
+        details, pending = self._parse_thread(
+            post_data, path, expand_more, parsers, fields
+        )
+        if pending is not None:
+            self._expand_more(*pending, max_workers, parsers.comment)
+        return details, details is not None
 
-        comments = self._extract_comments(post_data[1]["data"]["children"])
-        logger.info("Successfully scraped post: %s", title)
-        return {"title": title, "body": body, "comments": comments}
+    def scrape_many_post_details(
+        self,
+        permalinks,
+        max_workers=8,
+        ordered=True,
+        expand_more=False,
+        fields=None,
+        raw=False,
+    ):
+        """Scrape many posts concurrently, yielding a BatchResult per permalink.
+
+        Calls run on ``max_workers`` threads sharing this client's
+        connection pool, rate limiter and caches. Results arrive in input
+        order, or as they complete with ``ordered=False``. ``value`` is what
+        scrape_post_details returned (None if the post could not be
+        fetched); ``error`` holds any exception raised for that permalink.
+        """
+        return fan_out(
+            partial(
+                self.scrape_post_details,
+                expand_more=expand_more,
+                fields=fields,
+                raw=raw,
+            ),
+            permalinks,
+            max_workers,
+            ordered,
+        )
 
-    def _extract_comments(self, comments):
-        extracted_comments = []
-        for comment in comments:
-            if isinstance(comment, dict) and comment.get("kind") == "t1":
-                comment_data = comment.get("data", {})
-                extracted_comment = {
-                    "author": comment_data.get("author", ""),
-                    "body": comment_data.get("body", ""),
-                    "score": comment_data.get("score", 0),
-                    "replies": [],
-                }
-
-                replies = comment_data.get("replies", "")
-                if isinstance(replies, dict):
-                    extracted_comment["replies"] = self._extract_comments(
-                        replies.get("data", {}).get("children", [])
-                    )
-                extracted_comments.append(extracted_comment)
-        return extracted_comments
-
-    def scrape_user_data(self, username, limit=10):
-        logger.info("Scraping user data for %s, limit: %d", username, limit)
-        path = f"/user/{username}/overview"
-        after = None
-        all_items = []
+    def scrape_comment_tree(self, permalink, expand_more=False, max_workers=1):
+        """Scrape a post's comments into a flat, array-backed CommentTree.
 
-        while len(all_items) < limit:
-            params = {"limit": min(100, limit - len(all_items)), "after": after}
-            data = self._get_json(path, params)
-            if data is None:
-                break
+        See yars.columns.CommentTree for top-k, subtree and per-author
+        statistics. ``expand_more`` and ``max_workers`` work as for
+        scrape_post_details.
+        """
+        if expand_more:
+            details = self.scrape_post_details(permalink, True, max_workers)
+            if details is None:
+                return None
+            return CommentTree.from_comments(details["comments"])
 
-            if "data" not in data or "children" not in data["data"]:
-                logger.warning("Unexpected response shape for user %s", username)
-                break
+        path = permalink.rstrip("/")
+        children = self._comment_listing(self._get_json(path), path)
+        if children is None:
+            return None
+        return CommentTree.from_listing(children)
 
-            items = data["data"]["children"]
-            if not items:
-                break
+    def iter_post_comments(self, permalink):
+        """Yield a post's comments lazily as flat records.
 
-            for item in items:
-                kind = item["kind"]
-                item_data = item["data"]
-                item_url = f"https://www.reddit.com{item_data.get('permalink', '')}"
-                if kind == "t3":
-                    all_items.append(
-                        {
-                            "type": "post",
-                            "title": item_data.get("title", ""),
-                            "subreddit": item_data.get("subreddit", ""),
-                            "url": item_url,
-                            "created_utc": item_data.get("created_utc", ""),
-                        }
-                    )
-                elif kind == "t1":
-                    all_items.append(
-                        {
-                            "type": "comment",
-                            "subreddit": item_data.get("subreddit", ""),
-                            "body": item_data.get("body", ""),
-                            "created_utc": item_data.get("created_utc", ""),
-                            "url": item_url,
-                        }
-                    )
-                if len(all_items) >= limit:
+        Records carry ``id``, ``parent_id``, ``depth``, ``author``, ``body``
+        and ``score`` (see parsers.iter_comments). The thread is fetched in
+        one request, but no nested comment structure is built.
+        """
+        path = permalink.rstrip("/")
+        post_data = self._get_json(path)
+        children = self._comment_listing(post_data, path)
+        if children is None:
+            return
+        main_post = post_data[0]["data"]["children"][0]["data"]
+        yield from iter_comments(children, main_post.get("name"))
+
+    def _fetch_more_children(self, link_id, ids):
+        params = self._more_children_params(link_id, ids)
+        return self._more_children_things(self._get_json("/api/morechildren", params))
+
+    def _expand_more(self, link_id, comments, index, more, max_workers, comment):
+        """Resolve "more" stubs round by round until none are left."""
+        seen = set()
+        fetch = partial(self._fetch_more_children, link_id)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while more:
+                ids = [i for i in dict.fromkeys(more) if i not in seen]
+                more.clear()
+                if not ids:
                     break
+                seen.update(ids)
+                things = [t for batch in pool.map(fetch, chunk_ids(ids)) for t in batch]
+                added = splice_more_children(things, comments, index, more, comment)
+                logger.info("Expanded %d more comments for %s", added, link_id)
 
-            after = data["data"].get("after")
-            if not after:
-                break
+    def _extract_comments(self, comments):
+        return extract_comments(comments, comment=self.parsers.comment)
 
-            time.sleep(random.uniform(1, 2))
+    def scrape_user_data(
+        self, username, limit=10, resume=False, fields=None, raw=False
+    ):
+        fields = None if fields is None else tuple(fields)
+        if resume:
+            # A resumed crawl returns only the remainder; don't cache that.
+            items, _ = self._scrape_user_data(username, limit, resume, fields, raw)
+            return items
+        return self._memoized(
+            ("user", username, limit, fields, raw),
+            self._scrape_user_data,
+            username,
+            limit,
+            False,
+            fields,
+            raw,
+        )
 
+    def _scrape_user_data(self, username, limit, resume, fields, raw):
+        """Return ``(items, complete)``; a failed page makes it incomplete."""
+        logger.info("Scraping user data for %s, limit: %d", username, limit)
+        listing = self.iter_user_items(
+            username, limit, resume=resume, fields=fields, raw=raw
+        )
+        all_items = [item for item in listing]
         logger.info("Scraped %d items for user %s", len(all_items), username)
-        return all_items
+        return all_items, not listing.failed
+
+    def iter_user_items(
+        self, username, limit=10, after=None, resume=False, fields=None, raw=False
+    ):
+        """Lazily page through a user's posts and comments.
+
+        Returns a Listing yielding the same items as scrape_user_data, one
+        page at a time; its ``after`` attribute is the cursor of the next
+        page and can be passed back in to resume. With a checkpoint store
+        configured, ``resume=True`` continues from the last saved cursor.
+        """
+        path = f"/user/{username}/overview"
+        parsers, typed = self._parsers_for(fields, raw)
+
+        def fetch_page(after, page_limit):
+            params = {"limit": page_limit, "after": after}
+            data = self._get_json(path, params, typed)
+            return self._user_page(data, parsers, username)
+
+        return Listing(
+            fetch_page,
+            limit,
+            after,
+            checkpoint=self._checkpoint(path, resume=resume),
+            resume=resume,
+        )
 
     def fetch_subreddit_posts(
-        self, subreddit, limit=10, category="hot", time_filter="all"
+        self,
+        subreddit,
+        limit=10,
+        category="hot",
+        time_filter="all",
+        resume=False,
+        fields=None,
+        raw=False,
     ):
         logger.info(
             "Fetching subreddit/user posts for %s, limit: %d, category: %s, time_filter: %s",
@@ -270,71 +615,134 @@ class YARS:
             category,
             time_filter,
         )
-        if category not in SUBREDDIT_CATEGORIES + USER_CATEGORIES:
-            raise ValueError(
-                f"Category must be one of {SUBREDDIT_CATEGORIES} for a subreddit "
-                f"or {USER_CATEGORIES} for a user"
-            )
-        if time_filter not in TIME_FILTERS:
-            raise ValueError(f"time_filter must be one of {TIME_FILTERS}")
+        listing = self.iter_subreddit_posts(
+            subreddit,
+            limit,
+            category,
+            time_filter,
+            resume=resume,
+            fields=fields,
+            raw=raw,
+        )
+        all_posts = [post for post in listing]
+        logger.info("Fetched %d posts for %s", len(all_posts), subreddit)
+        return all_posts
 
-        if category in USER_CATEGORIES:
-            path = f"/user/{subreddit}/submitted"
-            params_extra = {"sort": category[4:]}
-        else:
-            path = f"/r/{subreddit}/{category}"
-            params_extra = {}
+    def iter_subreddit_posts(
+        self,
+        subreddit,
+        limit=10,
+        category="hot",
+        time_filter="all",
+        after=None,
+        resume=False,
+        fields=None,
+        raw=False,
+    ):
+        """Lazily page through a subreddit's (or user's) posts.
+
+        Takes the same arguments as fetch_subreddit_posts and returns a
+        Listing that fetches one page per 100 posts as it is iterated; its
+        ``after`` attribute is the cursor of the next page and can be
+        passed back in to resume. With a checkpoint store configured,
+        ``resume=True`` continues from the last saved cursor.
+
+        ``fields=("id", "score", "created_utc")`` yields dicts of just those
+        keys of each post's ``data`` (see parsers.projected_parsers), and
+        ``raw=True`` yields Reddit's listing children untouched. The search,
+        user and by-id methods take the same two options.
+        """
+        parsers, typed = self._parsers_for(fields, raw)
+        return self._iter_listing(
+            subreddit,
+            limit,
+            category,
+            time_filter,
+            after,
+            resume,
+            parsers.listing_post,
+            typed,
+        )
 
-        after = None
-        all_posts = []
+    def _iter_listing(
+        self, subreddit, limit, category, time_filter, after, resume, parse, typed=True
+    ):
+        path, shared, checkpoint = self._listing_request(
+            subreddit, category, time_filter, resume
+        )
 
-        while len(all_posts) < limit:
-            params = {
-                "limit": min(100, limit - len(all_posts)),
-                "after": after,
-                "raw_json": 1,
-                "t": time_filter,
-                **params_extra,
-            }
-            data = self._get_json(path, params)
+        def fetch_page(after, page_limit):
+            params = {"limit": page_limit, "after": after, **shared}
+            data = self._get_json(path, params, typed)
             if data is None:
-                break
-
-            posts = data.get("data", {}).get("children", [])
-            if not posts:
-                break
+                return None
+            return parse_listing_page(data, parse)
 
-            for post in posts:
-                post_data = post["data"]
-                post_info = {
-                    "title": post_data["title"],
-                    "author": post_data["author"],
-                    "permalink": post_data["permalink"],
-                    "score": post_data["score"],
-                    "num_comments": post_data["num_comments"],
-                    "created_utc": post_data["created_utc"],
-                    "body": post_data.get("selftext", ""),
-                }
-                if post_data.get("post_hint") == "image" and "url" in post_data:
-                    post_info["image_url"] = post_data["url"]
-                elif "preview" in post_data and "images" in post_data["preview"]:
-                    post_info["image_url"] = post_data["preview"]["images"][0][
-                        "source"
-                    ]["url"]
-                thumbnail = post_data.get("thumbnail") or ""
-                # Reddit uses placeholders like "self", "default", "nsfw", "spoiler"
-                if thumbnail.startswith("http"):
-                    post_info["thumbnail_url"] = thumbnail
-
-                all_posts.append(post_info)
-                if len(all_posts) >= limit:
-                    break
+        return Listing(fetch_page, limit, after, checkpoint=checkpoint, resume=resume)
 
-            after = data["data"].get("after")
-            if not after:
-                break
+    def fetch_subreddit_batch(
+        self, subreddit, limit=10, category="hot", time_filter="all", resume=False
+    ):
+        """Fetch posts like fetch_subreddit_posts, into a columnar PostBatch.
+
+        Each page's raw post data goes straight into the batch's typed
+        columns without building per-post dicts or records; see
+        yars.columns for the numpy and Arrow exports.
+        """
+        listing = self._iter_listing(
+            subreddit, limit, category, time_filter, None, resume, listing_post_data
+        )
+        batch = PostBatch()
+        for page in listing.pages():
+            batch.extend(page)
+        logger.info("Fetched %d posts for %s", len(batch), subreddit)
+        return batch
 
-            time.sleep(random.uniform(1, 2))
+    def fetch_many_subreddits(
+        self,
+        subreddits,
+        category="hot",
+        time_filter="all",
+        limit=10,
+        max_workers=8,
+        fields=None,
+        raw=False,
+    ):
+        """Crawl many subreddits at once, streaming their posts as they arrive.
+
+        Pagination is interleaved across up to ``max_workers`` subreddits
+        under this client's single rate budget, so time one subreddit spends
+        waiting is used to fetch another. Yields ``BatchResult(subreddit,
+        post, None)`` per post (``limit`` per subreddit), or
+        ``BatchResult(subreddit, None, error)`` if a subreddit's crawl
+        raised.
+        """
+        sources = [
+            (
+                name,
+                self.iter_subreddit_posts(
+                    name, limit, category, time_filter, fields=fields, raw=raw
+                ).pages(),
+            )
+            for name in subreddits
+        ]
+        return flatten_pages(interleave(sources, max_workers))
+
+    def fetch_posts_by_id(self, ids, fields=None, raw=False):
+        """Fetch metadata for many posts, up to 100 per request.
+
+        ``ids`` are post ids ("1frb5ib") or fullnames ("t3_1frb5ib"). Uses
+        Reddit's /api/info endpoint (the batched equivalent of /by_id) and
+        returns posts in the same shape as fetch_subreddit_posts; posts that
+        no longer exist are skipped.
+        """
+        ids = list(ids)
+        parsers, typed = self._parsers_for(fields, raw)
+        all_posts = []
+        for batch in chunk_fullnames(ids):
+            params = {"id": ",".join(batch), "raw_json": 1}
+            data = self._get_json("/api/info", params, typed)
+            all_posts.extend(self._info_posts(data, parsers))
 
-        logger.info("Fetched %d posts for %s", len(all_posts), subreddit)
+        logger.info("Fetched %d of %d posts by id", len(all_posts), len(ids))
         return all_posts